@@ -0,0 +1,18 @@
+"""
+Turn actions shared by the CPU controllers, search and simulation.
+
+Positions are (col, row) tiles; attack_idx indexes card.attacks.
+"""
+
+from typing import NamedTuple, Tuple
+
+
+class Move(NamedTuple):
+    src: Tuple[int, int]
+    dst: Tuple[int, int]
+
+
+class Attack(NamedTuple):
+    src: Tuple[int, int]
+    attack_idx: int
+    dst: Tuple[int, int]
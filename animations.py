@@ -75,8 +75,9 @@ class AnimationManager:
         })
         self.blocking = True
 
-    def trigger_move_anim(self, start_pos, end_pos, on_arrive_callback):
+    def trigger_move_anim(self, start_pos, end_pos, on_arrive_callback, path=None):
         # Create a movement animation
+        # path: optional list of pixel waypoints (start .. end) to follow
         sx, sy = start_pos
         ex, ey = end_pos
         # Store animation data
@@ -84,6 +85,7 @@ class AnimationManager:
             'start': (sx, sy),
             'curr': [sx, sy],
             'end': (ex, ey),
+            'path': path if path and len(path) > 2 else None,
             'element': 'move',  # Special element for movement
             'progress': 0.0,
             'callback': on_arrive_callback
@@ -108,12 +110,21 @@ class AnimationManager:
             proj['progress'] += 0.05 # Speed of projectile
             t = proj['progress']
             
-            # Linear interpolation
+            # Linear interpolation (along the path segments for moves)
             start_x, start_y = proj['start']
             end_x, end_y = proj['end']
-            
-            curr_x = start_x + (end_x - start_x) * t
-            curr_y = start_y + (end_y - start_y) * t
+
+            path = proj.get('path')
+            if path:
+                segs = len(path) - 1
+                seg = min(int(t * segs), segs - 1)
+                local = min(1.0, t * segs - seg)
+                (ax, ay), (bx, by) = path[seg], path[seg + 1]
+                curr_x = ax + (bx - ax) * local
+                curr_y = ay + (by - ay) * local
+            else:
+                curr_x = start_x + (end_x - start_x) * t
+                curr_y = start_y + (end_y - start_y) * t
             proj['curr'] = [curr_x, curr_y]
 
             # Trail particles
@@ -0,0 +1,101 @@
+"""
+Area-of-effect templates for the special attacks.
+
+A template is a fixed list of (dc, dr) offsets. The board-clipped tiles
+for each anchor position are computed once per board size and reused,
+so casting (or scoring) an AoE is a tuple lookup plus one occupancy read
+per tile.
+
+New AoE attacks are data: add an AoeEffect to AOE_EFFECTS and
+engine.attack picks it up.
+"""
+
+from dataclasses import dataclass
+
+
+class AoeTemplate:
+    def __init__(self, name, offsets):
+        self.name = name
+        self.offsets = tuple(offsets)
+        self._clipped = {}  # (cols, rows, c, r) -> tuple of (x, y)
+
+    def cells(self, grid, c, r):
+        """Template tiles around (c, r) that lie on the board, in offset order."""
+        key = (grid.cols, grid.rows, c, r)
+        cells = self._clipped.get(key)
+        if cells is None:
+            cols, rows = grid.cols, grid.rows
+            cells = self._clipped[key] = tuple(
+                (c + dc, r + dr) for dc, dr in self.offsets
+                if 0 <= c + dc < cols and 0 <= r + dr < rows
+            )
+        return cells
+
+    def units(self, grid, c, r):
+        """(x, y, card) for every card the template covers around (c, r)."""
+        out = []
+        for x, y in self.cells(grid, c, r):
+            card = grid.card_at(x, y)
+            if card:
+                out.append((x, y, card))
+        return out
+
+    def hits(self, grid, c, r, owner):
+        """(allies, opponents) of `owner` covered when anchored on (c, r)."""
+        allies = opponents = 0
+        for _, _, card in self.units(grid, c, r):
+            if card.owner == owner:
+                allies += 1
+            else:
+                opponents += 1
+        return allies, opponents
+
+
+# ------------------------------
+# SHAPES
+# ------------------------------
+PLUS = AoeTemplate("plus", [(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)])
+
+RING8 = AoeTemplate("ring8", [
+    (1, 0), (-1, 0), (0, 1), (0, -1),
+    (1, 1), (-1, -1), (1, -1), (-1, 1),
+])
+
+# Burning Trail: 5 tiles in a row, starting next to the caster
+TRAIL_EAST = AoeTemplate("trail_east", [(i, 0) for i in range(1, 6)])
+TRAIL_WEST = AoeTemplate("trail_west", [(-i, 0) for i in range(1, 6)])
+
+
+# ------------------------------
+# HEAL / BURN AoE ATTACKS
+# ------------------------------
+@dataclass
+class AoeEffect:
+    shape: AoeTemplate
+    heal_per_tick: int    # allies (each heals only once per card)
+    burn_per_tick: int    # opponents
+    heal_text: str
+    burn_text: str
+
+
+AOE_EFFECTS = {
+    "Nature's Embrace": AoeEffect(PLUS, 5, 8, "+HEAL", "-THORN"),
+    "Burning-Embrace Fusion": AoeEffect(RING8, 5, 10, "+FUSION HEAL", "-FUSION FIRE"),
+}
+
+
+def score_centers(effect, grid, centers, owner):
+    """
+    Bulk AI scoring: {center: (allies_healed, opponents_burned)} for
+    casting `effect` on each candidate center.
+    """
+    scores = {}
+    for c, r in centers:
+        healed = burned = 0
+        for _, _, card in effect.shape.units(grid, c, r):
+            if card.owner == owner:
+                healed += not card.healed_once
+            else:
+                burned += 1
+        scores[(c, r)] = (healed, burned)
+    return scores
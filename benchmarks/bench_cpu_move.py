@@ -0,0 +1,98 @@
+"""
+greedy_nearest_move latency vs move_range.
+
+"legacy" is the old implementation: one BFS per cell of the
+(2r+1)^2 bounding box, duplicates appended every time, and a loop over
+every player per candidate. "current" is logic_cpu.greedy_move.
+
+Run from the repo root:
+    python -m benchmarks.bench_cpu_move
+"""
+
+import random
+import time
+from collections import deque
+
+from card import Card
+from grid import Grid
+from logic_cpu.flow_field import DistanceField
+from logic_cpu.greedy_move import greedy_nearest_move
+
+BOARDS = [(23, 11, 3), (60, 60, 40)]  # cols, rows, players
+RANGES = [1, 2, 3, 4, 6, 8]
+REPEAT = 5
+
+
+def legacy_bfs(start, max_depth, grid):
+    visited = set()
+    queue = deque([(start, 0)])
+    reachable = set()
+    while queue:
+        (c, r), d = queue.popleft()
+        if d > max_depth:
+            continue
+        reachable.add((c, r))
+        for dc, dr in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nc, nr = c + dc, r + dr
+            if grid.in_bounds(nc, nr) and (nc, nr) not in visited:
+                visited.add((nc, nr))
+                queue.append(((nc, nr), d + 1))
+    return reachable
+
+
+def legacy_nearest_move(e_pos, players, grid, move_range):
+    possible_moves = []
+    for c in range(max(0, e_pos[0] - move_range), min(grid.cols, e_pos[0] + move_range + 1)):
+        for r in range(max(0, e_pos[1] - move_range), min(grid.rows, e_pos[1] + move_range + 1)):
+            for (c2, r2) in legacy_bfs(e_pos, move_range, grid):
+                if grid.tiles[c2][r2].card is None:
+                    possible_moves.append((c2, r2))
+
+    best_move, best_score = e_pos, 9999
+    for (c, r) in possible_moves:
+        total = sum(abs(abs(px - c) + abs(py - r) - 3) for px, py in players)
+        edge_penalty = 2 if c in (0, grid.cols - 1) or r in (0, grid.rows - 1) else 0
+        if total + edge_penalty < best_score:
+            best_score = total + edge_penalty
+            best_move = (c, r)
+    return best_move
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'board':>7} | {'players':>7} | {'range':>5} | {'legacy ms':>9} | {'current ms':>10}")
+    print("-" * 52)
+
+    for cols, rows, n_players in BOARDS:
+        grid = Grid(cols, rows)
+        spots = rng.sample([(c, r) for c in range(cols) for r in range(rows)], n_players + 1)
+        for i, (c, r) in enumerate(spots[1:]):
+            grid.place(c, r, Card("player", f"P{i}", 100, 100, [], index=i))
+        e_pos = (cols // 2, rows // 2)
+        if grid.card_at(*e_pos) is None:
+            grid.place(*e_pos, Card("enemy", "E", 100, 100, []))
+        players = grid.units("player")
+
+        for move_range in RANGES:
+            legacy = timed(lambda: legacy_nearest_move(e_pos, players, grid, move_range))
+
+            def current():
+                # a fresh field and reach cache each time = full per-turn cost
+                grid._reach = None
+                greedy_nearest_move(e_pos, players, grid, move_range, DistanceField(grid, players))
+
+            now = timed(current)
+            print(f"{cols}x{rows:<4} | {n_players:>7} | {move_range:>5} | {legacy * 1e3:9.2f} | {now * 1e3:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
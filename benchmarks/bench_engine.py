@@ -0,0 +1,69 @@
+"""
+Headless engine: how long `import engine` takes in a fresh interpreter
+(no pygame, no fonts) and how many turns per second random games run
+through legal_actions / apply.
+
+Run from the repo root:
+    python -m benchmarks.bench_engine
+"""
+
+import subprocess
+import sys
+import time
+
+import engine
+from game_rng import GameRNG
+from attack import Attack
+from card import Card
+from grid import Grid
+
+GAMES = 200
+MAX_TURNS = 200
+ELEMENTS = ["fire", "water", "leaf", "null"]
+
+
+def make_state(seed):
+    rng = GameRNG(seed)
+    grid = Grid(23, 11)
+    spots = rng.spawn.sample([(c, r) for c in range(23) for r in range(11)], 6)
+    for i, (c, r) in enumerate(spots):
+        owner = "player" if i < 3 else "enemy"
+        el = rng.spawn.choice(ELEMENTS)
+        attacks = [Attack("Strike", 20, el, 2), Attack("Blast", 30, el, 4), Attack("Jab", 10, el, 1)]
+        grid.place(c, r, Card(owner, f"{owner}{i % 3}", 100, 100, attacks,
+                              element=el, index=i % 3))
+    return engine.GameState(grid, rng=rng)
+
+
+def import_ms():
+    code = ("import sys, time; t = time.perf_counter(); import engine; "
+            "print((time.perf_counter() - t) * 1000, 'pygame' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    ms, pygame_loaded = out.stdout.split()
+    return float(ms), pygame_loaded == "True"
+
+
+def main():
+    ms, pygame_loaded = import_ms()
+    print(f"import engine: {ms:.1f} ms (pygame imported: {pygame_loaded})")
+
+    turns, wins = 0, {"player": 0, "enemy": 0, None: 0}
+    start = time.perf_counter()
+    for seed in range(GAMES):
+        state = make_state(seed)
+        for _ in range(MAX_TURNS):
+            if state.winner() is not None:
+                break
+            actions = engine.legal_actions(state)
+            engine.apply(state, state.rng.ai.choice(actions) if actions else None)
+            turns += 1
+        wins[state.winner()] += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{GAMES} random games, {turns} turns in {elapsed:.2f} s: "
+          f"{turns / elapsed:.0f} turns/sec")
+    print(f"player {wins['player']} | enemy {wins['enemy']} | unfinished {wins[None]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Grid storage benchmark: classic list-of-lists of Tile objects vs the
+flat occupancy array in grid.Grid, plus grid.SparseGrid on an arena too
+big for either.
+
+Both scans are timed on both layouts so each column compares like with
+like: "full scan" visits every tile and lists the occupied ones (the
+classic `for c: for r:` loop over Tile objects; on the flat array, a
+memcmp of every SCAN_BLOCK-tile block of the raw bytes against zeros,
+and itertools.compress over the few blocks that hold a card, so no
+Python code runs per tile), "occupied" lists only the tiles holding a
+card from an index (an occupied-position set on the tile grid,
+Grid.occupied() on the flat one).
+
+Run from the repo root:
+    python -m benchmarks.bench_grid
+"""
+
+import random
+import time
+import tracemalloc
+from itertools import compress
+
+from card import Card, Tile
+from grid import Grid, SparseGrid
+
+SIZES = [(200, 200), (1000, 1000)]
+SPARSE_SIZES = [(10000, 10000)]
+UNITS = 300
+SCANS = 5
+SCAN_BLOCK = 64  # tiles compared at once by full_scan_flat
+
+
+class LegacyGrid:
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.tiles = [[Tile(c, r) for r in range(rows)] for c in range(cols)]
+        self.taken = set()
+
+    def place(self, c, r, card):
+        self.tiles[c][r].card = card
+        if card:
+            self.taken.add((c, r))
+        else:
+            self.taken.discard((c, r))
+
+    def occupied(self):
+        tiles = self.tiles
+        for c, r in sorted(self.taken):
+            yield c, r, tiles[c][r].card
+
+
+def make_card(i):
+    return Card(owner="player" if i % 2 else "enemy", name=f"U{i}",
+                hp=100, max_hp=100, attacks=[], index=i)
+
+
+def measure_build(factory, cols, rows):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    g = factory(cols, rows)
+    build = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return g, build, mem
+
+
+def full_scan_legacy(g):
+    return [(c, r) for c, column in enumerate(g.tiles)
+            for r, tile in enumerate(column) if tile.card]
+
+
+def full_scan_flat(g):
+    cells, rows = g.cells, g.rows
+    raw = cells.tobytes()
+    step = SCAN_BLOCK * cells.itemsize
+    empty = bytes(step)
+    found = []
+    for start in range(0, len(raw), step):
+        if raw[start:start + step] != empty:
+            i = start // cells.itemsize
+            block = cells[i:i + SCAN_BLOCK]
+            found.extend(divmod(j, rows) for j in compress(range(i, i + len(block)), block))
+    return found
+
+
+def occupied_scan(g):
+    found = 0
+    for _ in g.occupied():
+        found += 1
+    return found
+
+
+def best_of(fn, g):
+    best = float("inf")
+    for _ in range(SCANS):
+        t0 = time.perf_counter()
+        fn(g)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    rng = random.Random(1)
+    print(f"{'board':>11} | {'impl':>6} | {'build s':>8} | {'memory MB':>9} | "
+          f"{'full scan ms':>12} | {'occupied ms':>11}")
+    print("-" * 73)
+
+    for cols, rows in SIZES:
+        spots = rng.sample(range(cols * rows), UNITS)
+
+        legacy, l_build, l_mem = measure_build(LegacyGrid, cols, rows)
+        flat, f_build, f_mem = measure_build(Grid, cols, rows)
+
+        for i, idx in enumerate(spots):
+            c, r = divmod(idx, rows)
+            card = make_card(i)
+            legacy.place(c, r, card)
+            flat.place(c, r, card)
+
+        assert full_scan_legacy(legacy) == full_scan_flat(flat)
+        assert len(full_scan_flat(flat)) == UNITS
+        assert occupied_scan(legacy) == occupied_scan(flat) == UNITS
+
+        board = f"{cols}x{rows}"
+        for name, g, build, mem, full_scan in (
+            ("tiles", legacy, l_build, l_mem, full_scan_legacy),
+            ("flat", flat, f_build, f_mem, full_scan_flat),
+        ):
+            full = best_of(full_scan, g)
+            occ = best_of(occupied_scan, g)
+            print(f"{board:>11} | {name:>6} | {build:8.3f} | {mem / 1e6:9.1f} | "
+                  f"{full * 1e3:12.2f} | {occ * 1e3:11.2f}")
+
+        del legacy, flat
+
+    for cols, rows in SPARSE_SIZES:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        sparse = SparseGrid(cols, rows)
+        for i in range(UNITS):
+            sparse.place(rng.randrange(cols), rng.randrange(rows), make_card(i))
+        build = time.perf_counter() - t0
+        mem = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        # a full scan of 10^8 tiles is what SparseGrid exists to avoid
+        s_occ = best_of(occupied_scan, sparse)
+
+        board = f"{cols}x{rows}"
+        print(f"{board:>11} | {'sparse':>6} | {build:8.3f} | {mem / 1e6:9.1f} | "
+              f"{'-':>12} | {s_occ * 1e3:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Root-parallel MCTS: playouts per turn vs worker count at a fixed time
+budget. With near-linear scaling the playouts column grows with the
+workers while seconds stays at the budget.
+
+Run from the repo root:
+    python -m benchmarks.bench_parallel
+"""
+
+import os
+import random
+
+from attack import Attack
+from card import Card
+from grid import Grid
+from logic_cpu.parallel import ParallelMCTS, shutdown_pool
+from logic_cpu.simulation import ENEMY, state_from_grid
+
+TIME_MS = 500
+ELEMENTS = ["fire", "water", "leaf", "null"]
+
+
+def make_state(seed=5):
+    rng = random.Random(seed)
+    grid = Grid(23, 11)
+    spots = rng.sample([(c, r) for c in range(23) for r in range(11)], 6)
+    for i, (c, r) in enumerate(spots):
+        owner = "player" if i < 3 else "enemy"
+        el = rng.choice(ELEMENTS)
+        attacks = [Attack("Strike", 20, el, 2), Attack("Blast", 30, el, 4), Attack("Jab", 10, el, 1)]
+        grid.place(c, r, Card(owner, f"{owner}{i % 3}", 100, 100, attacks,
+                              element=el, index=i % 3))
+    return state_from_grid(grid, to_move=ENEMY)
+
+
+def main():
+    state = make_state()
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, 32, cores} & set(range(1, cores + 1)))
+
+    print(f"{'workers':>7} | {'playouts':>8} | {'per sec':>8} | {'speedup':>7} | {'seconds':>7}")
+    print("-" * 50)
+    base = None
+    for workers in counts:
+        search = ParallelMCTS(workers=workers, time_ms=TIME_MS, seed=1)
+        search.choose(state)  # warm the pool
+        search.choose(state)
+        stats = search.last_stats
+        base = base or stats["playouts_per_sec"]
+        print(f"{workers:>7} | {stats['iterations']:>8} | {stats['playouts_per_sec']:8.0f} | "
+              f"{stats['playouts_per_sec'] / base:7.2f} | {stats['seconds']:7.3f}")
+    shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
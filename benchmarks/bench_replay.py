@@ -0,0 +1,73 @@
+"""
+Binary replays: size per game and headless replay speed. Random 3v3
+games are recorded through engine.place / engine.apply, then every
+replay is played back and checked against the recorded final board.
+"x real-time" is game frames replayed per second over FPS.
+
+Run from the repo root:
+    python -m benchmarks.bench_replay
+"""
+
+import time
+
+import engine
+from actions import Attack
+from config import FPS
+from game_rng import GameRNG
+from grid import Grid
+from replay import ReplayRecorder, replay
+from roster import ELEMENTS, make_card
+
+GAMES = 300
+MAX_TURNS = 200
+
+
+def board(state):
+    return sorted((c, r, card.owner, card.index, card.hp, card.shield)
+                  for c, r, card in state.grid.occupied())
+
+
+def record_game(seed):
+    rng = GameRNG(seed)
+    state = engine.GameState(Grid(23, 11), rng=rng)
+    recorder = ReplayRecorder(state)
+
+    spots = rng.spawn.sample([(c, r) for c in range(23) for r in range(11)], 6)
+    for i, (c, r) in enumerate(spots):
+        owner = "player" if i < 3 else "enemy"
+        engine.place(state, c, r, make_card(owner, i % 3, rng.spawn.choice(ELEMENTS)))
+
+    for _ in range(MAX_TURNS):
+        if state.winner() is not None:
+            break
+        actions = engine.legal_actions(state)
+        # mostly attacks, so most games end within MAX_TURNS
+        attacks = [a for a in actions if isinstance(a, Attack)]
+        pool = attacks if attacks and rng.ai.random() < 0.7 else actions
+        engine.apply(state, rng.ai.choice(pool) if pool else None)
+    return recorder.data(), board(state), state.frame
+
+
+def main():
+    start = time.perf_counter()
+    games = [record_game(seed) for seed in range(GAMES)]
+    record_s = time.perf_counter() - start
+
+    sizes = [len(blob) for blob, _, _ in games]
+    frames = sum(f for _, _, f in games)
+
+    start = time.perf_counter()
+    finals = [replay(blob) for blob, _, _ in games]
+    replay_s = time.perf_counter() - start
+
+    mismatches = sum(board(s) != b for s, (_, b, _) in zip(finals, games))
+    print(f"{GAMES} games recorded in {record_s:.2f} s")
+    print(f"bytes/game: mean {sum(sizes) / GAMES:.0f} | max {max(sizes)} | "
+          f"total {sum(sizes) / 1024:.1f} KiB")
+    print(f"replayed in {replay_s:.2f} s: {GAMES / replay_s:.0f} games/sec, "
+          f"{frames / replay_s / FPS:.0f}x real-time")
+    print(f"final boards matching: {GAMES - mismatches}/{GAMES}")
+
+
+if __name__ == "__main__":
+    main()
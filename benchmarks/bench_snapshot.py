@@ -0,0 +1,78 @@
+"""
+Snapshot / restore throughput on a mid-game 3v3 board with effects
+running, against copy.deepcopy of the grid and effect lists. "branch"
+is the what-if loop search and undo run: snapshot, apply one action,
+restore.
+
+Run from the repo root:
+    python -m benchmarks.bench_snapshot
+"""
+
+import copy
+import time
+
+import engine
+from actions import Attack
+from game_rng import GameRNG
+from grid import Grid
+from roster import ELEMENTS, make_card
+
+N = 20_000
+DEEPCOPY_N = 500
+
+
+def midgame_state(seed=3, turns=12):
+    rng = GameRNG(seed)
+    state = engine.GameState(Grid(23, 11), rng=rng)
+    spots = rng.spawn.sample([(c, r) for c in range(23) for r in range(11)], 6)
+    for i, (c, r) in enumerate(spots):
+        owner = "player" if i < 3 else "enemy"
+        engine.place(state, c, r, make_card(owner, i % 3, rng.spawn.choice(ELEMENTS)))
+    for _ in range(turns):
+        actions = engine.legal_actions(state)
+        attacks = [a for a in actions if isinstance(a, Attack)]
+        engine.apply(state, rng.ai.choice(attacks or actions), frames=5)
+    return state
+
+
+def rate(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = time.perf_counter() - start
+    return n / elapsed, elapsed / n * 1e6
+
+
+def main():
+    state = midgame_state()
+    snap = engine.snapshot(state)
+    actions = engine.legal_actions(state)
+    print(f"{len(snap.units)} units, {len(snap.flames)} flames, "
+          f"{len(snap.regen) + len(snap.burn)} effects, {len(actions)} actions")
+
+    def branch(i=[0]):
+        s = engine.snapshot(state)
+        engine.apply(state, actions[i[0] % len(actions)], frames=1)
+        engine.restore(state, s)
+        i[0] += 1
+
+    rows = [
+        ("snapshot", rate(lambda: engine.snapshot(state), N)),
+        ("snapshot + rng", rate(lambda: engine.snapshot(state, rng=True), N)),
+        ("restore", rate(lambda: engine.restore(state, snap), N)),
+        ("branch", rate(branch, N)),
+        ("deepcopy", rate(lambda: copy.deepcopy(
+            (state.grid, state.flame_tiles, state.regen_effects, state.burn_effects)),
+            DEEPCOPY_N)),
+    ]
+    print(f"{'':>15} | {'per sec':>9} | {'us each':>8}")
+    print("-" * 38)
+    for name, (per_sec, us) in rows:
+        print(f"{name:>15} | {per_sec:9.0f} | {us:8.2f}")
+
+    ok = engine.snapshot(state) == snap
+    print(f"state after {N} branches matches the snapshot: {ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Bitboards: whole-board tile sets packed into one Python int.
+
+Bit i is tile (c, r) with i = c * rows + r, the same flat index the Grid
+uses. Growing a region by one step is a handful of shifts, masks and ORs
+instead of a per-node BFS. grid.bfs_reachable (with obstacles) and
+grid.bfs_open use it, so every move range (grid.reach: the move overlay,
+legal moves, greedy moves) is a few dilations of the occupancy bitboard.
+
+Only occupancy and ownership are kept as bitboards. Flames are drawn
+with their timer and owner and the CPU reads their damage per tile from
+influence.InfluenceMaps, so a flame bitboard would only answer what
+those lookups already answer in O(1); likewise the CPU threat checks
+need damage per tile (logic_cpu/threat_map.py), not a yes / no set.
+
+Ints grow with the board, so this pays off on normal-sized boards;
+huge (sparse) arenas should keep using the BFS helpers in grid.py.
+"""
+
+from functools import lru_cache
+
+BITBOARD_MAX_TILES = 1 << 14
+
+
+class BitLayout:
+    """Masks for one board size. Get one through layout(cols, rows)."""
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.full = (1 << (cols * rows)) - 1
+
+        # one bit at the top of every column: (2^(cols*rows) - 1) / (2^rows - 1)
+        first_row = self.full // ((1 << rows) - 1)
+        last_row = first_row << (rows - 1)
+        self.not_first_row = self.full & ~first_row
+        self.not_last_row = self.full & ~last_row
+
+    def bit(self, c, r):
+        return 1 << (c * self.rows + r)
+
+    def from_positions(self, positions):
+        rows = self.rows
+        bits = 0
+        for c, r in positions:
+            bits |= 1 << (c * rows + r)
+        return bits
+
+    def positions(self, bits):
+        """Tiles in `bits`, in column-major order."""
+        rows = self.rows
+        out = []
+        while bits:
+            low = bits & -bits
+            out.append(divmod(low.bit_length() - 1, rows))
+            bits ^= low
+        return out
+
+    def has(self, bits, c, r):
+        return (bits >> (c * self.rows + r)) & 1
+
+    def dilate(self, bits):
+        """bits plus every tile one step away (up, down, left, right)."""
+        rows = self.rows
+        return (
+            bits
+            | (bits << rows)
+            | (bits >> rows)
+            | ((bits & self.not_last_row) << 1)
+            | ((bits & self.not_first_row) >> 1)
+        ) & self.full
+
+    def expand(self, bits, radius):
+        """Every tile within `radius` steps of any tile in bits (no obstacles)."""
+        for _ in range(radius):
+            grown = self.dilate(bits)
+            if grown == bits:
+                break
+            bits = grown
+        return bits
+
+    def reachable(self, start_bits, radius, blocked=0):
+        """Like expand, but blocked tiles are never entered."""
+        open_tiles = self.full & ~blocked
+        region = start_bits
+        for _ in range(radius):
+            grown = region | (self.dilate(region) & open_tiles)
+            if grown == region:
+                break
+            region = grown
+        return region
+
+
+@lru_cache(maxsize=8)
+def layout(cols, rows):
+    return BitLayout(cols, rows)
+
+
+class BoardBits:
+    """
+    Occupancy and ownership of one Grid as bitboards. Built from the unit
+    registry; Grid.bits() keeps one per occupancy version.
+    """
+
+    def __init__(self, grid):
+        self.layout = layout(grid.cols, grid.rows)
+        self.owners = {}
+        for owner in grid.owners():
+            self.owners[owner] = self.layout.from_positions(grid.units(owner))
+
+        occupied = 0
+        for bits in self.owners.values():
+            occupied |= bits
+        self.occupied = occupied
+
+    def owned(self, owner):
+        return self.owners.get(owner, 0)
@@ -2,6 +2,13 @@ from dataclasses import dataclass
 from typing import Optional
 from attack import Attack
 
+RARITY_MULT = {
+    "normal": 1.0,
+    "rare": 1.1,
+    "epic": 1.25,
+    "legendary": 1.5
+}
+
 @dataclass
 class Card:
     owner: str
@@ -5,3 +5,32 @@ TILE_SIZE = 75
 WIDTH = GRID_COLS * TILE_SIZE
 HEIGHT = GRID_ROWS * TILE_SIZE + 150
 FPS = 60
+
+# Match seed for combat / spawn / CPU randomness (see game_rng.py);
+# None = a fresh seed every launch
+GAME_SEED = None
+
+# Directory to save each game's binary replay (replay.py) to on quit,
+# e.g. "replays"; None = don't record
+REPLAY_DIR = None
+
+# Boards with more tiles than this use the sparse, chunked grid storage
+SPARSE_GRID_THRESHOLD = 4_000_000
+CHUNK_SIZE = 32
+
+# CPU controller: "greedy", "joint", "alphabeta", "mcts", "parallel",
+# "background" or "cooperative" (see logic_cpu/logic_cpu.py)
+CPU_MODE = "greedy"
+SEARCH_DEPTH = 3
+SEARCH_TIME_MS = 250
+MCTS_TIME_MS = 250
+CPU_WORKERS = 0  # "parallel" mode: 0 = one per core, 1 = search in-process
+
+# "background" mode: search on a worker thread, BACKGROUND_CPU_MODE is
+# "alphabeta" or "mcts"; past the deadline the best action so far is played
+BACKGROUND_CPU_MODE = "mcts"
+CPU_DEADLINE_MS = 1000
+
+# "cooperative" mode: ms of every frame left for events and drawing; the
+# MCTS search (MCTS_TIME_MS of thinking in total) gets the rest
+CPU_FRAME_RESERVE_MS = 6
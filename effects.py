@@ -1,91 +1,94 @@
-import pygame
-from config import FPS
+"""
+effects.py
+----------
+The GUI side of the rules engine.
+
+The rules themselves (flames, regen, burn, attacks) live in engine.py
+and know nothing about drawing. live_state(grid) is the GameState of the
+game played on `grid`, with its own flame / regen / burn lists and a
+subscriber that turns its events (events.py) into floating texts and hit
+flashes. Only the event types in RENDERERS are subscribed; the rest cost
+nothing here.
+"""
+
 from colors import E_FIRE, E_LEAF
 from grid import cell_center
 from animations import anim_mgr
+import engine
+from game_rng import GameRNG
+from events import DamageDealt, ShieldAbsorbed, Healed, UnitHit, TrailCast, EffectApplied
+
 
 # ==================================================
-# GLOBAL EFFECT LISTS
+# ENGINE EVENTS -> FLOATING TEXT
 # ==================================================
-# flame_tiles: [col, row, time_left, owner]
-flame_tiles = []
+def _on_trail(ev):
+    anim_mgr.add_floating_text("🔥 FIRE TRAIL", *cell_center(*ev.pos), E_FIRE)
 
-# regen_effects: [card, heal_per_tick, time_left, (col,row)]
-regen_effects = []
 
-# burn_effects: [card, dmg_per_tick, time_left, (col,row)]
-burn_effects = []
+def _on_hit(ev):
+    ev.card.flash_timer = 10 if ev.cause == "trail" else 8
 
 
-# ==================================================
-# 🔥 FIRE TRAIL DAMAGE (CAN KILL)
-# ==================================================
-def process_flame_tiles(grid):
-    for ft in flame_tiles[:]:
-        c, r, t, owner = ft
-        t -= 1
-        ft[2] = t
+def _on_damage(ev):
+    if ev.cause == "normal":
+        anim_mgr.add_floating_text(f"-{ev.amount}", *cell_center(*ev.pos))
+    elif ev.cause == "flame":
+        anim_mgr.add_floating_text(f"-{ev.amount}🔥", *cell_center(*ev.pos), E_FIRE)
+    else:
+        anim_mgr.add_floating_text(f"-{ev.amount}", *cell_center(*ev.pos), E_FIRE)
 
-        # remove expired fire
-        if t <= 0:
-            flame_tiles.remove(ft)
-            continue
 
-        if not grid.in_bounds(c, r):
-            continue
+def _on_shield(ev):
+    anim_mgr.add_floating_text(f"-{ev.amount}🛡", *cell_center(*ev.pos))
 
-        card = grid.tiles[c][r].card
 
-        # ❗ damage ONLY enemies of owner
-        if card and card.owner != owner:
-            card.hp -= 5
-            anim_mgr.add_floating_text("-5🔥", *cell_center(c, r), E_FIRE)
+def _on_effect(ev):
+    if ev.kind == "regen":
+        anim_mgr.add_floating_text(ev.effect.heal_text, *cell_center(*ev.pos), E_LEAF)
+    else:
+        anim_mgr.add_floating_text(ev.effect.burn_text, *cell_center(*ev.pos), E_FIRE)
 
-            if card.hp <= 0:
-                grid.tiles[c][r].card = None
 
+def _on_heal(ev):
+    anim_mgr.add_floating_text("+HEAL", *cell_center(*ev.pos), E_LEAF)
 
-# ==================================================
-# 🌿 HEAL OVER TIME (LIMITED BY healed_once FLAG)
-# ==================================================
-def process_regen():
-    for eff in regen_effects[:]:
-        card, heal, t, pos = eff
-        t -= 1
-        eff[2] = t
 
-        # card might already be dead
-        if card.hp <= 0:
-            regen_effects.remove(eff)
-            continue
+RENDERERS = {
+    TrailCast: _on_trail,
+    UnitHit: _on_hit,
+    DamageDealt: _on_damage,
+    ShieldAbsorbed: _on_shield,
+    EffectApplied: _on_effect,
+    Healed: _on_heal,
+}
 
-        # partial heal only
-        card.hp = min(card.max_hp, card.hp + heal)
-        anim_mgr.add_floating_text("+HEAL", *cell_center(*pos), E_LEAF)
 
-        if t <= 0:
-            regen_effects.remove(eff)
+def live_state(grid):
+    """The GameState of the game played on `grid`, created on first use."""
+    state = grid.game
+    if state is None:
+        state = grid.game = engine.GameState(grid, rng=GameRNG.for_grid(grid))
+        for event_type, fn in RENDERERS.items():
+            state.bus.subscribe(event_type, fn)
+    return state
 
 
 # ==================================================
-# 🔥 BURN DAMAGE (CAN KILL)
+# PER-FRAME TICKS
 # ==================================================
-def process_burn(grid):
-    for eff in burn_effects[:]:
-        card, dmg, t, pos = eff
-        t -= 1
-        eff[2] = t
+def process_effects(grid):
+    """One frame of flames, regen and burn (advances the game's frame count)."""
+    engine.tick(live_state(grid))
+
+
+def process_flame_tiles(grid):
+    engine.tick_flames(live_state(grid))
 
-        # card might already be dead
-        if card.hp <= 0:
-            burn_effects.remove(eff)
-            continue
 
-        card.hp -= dmg
-        anim_mgr.add_floating_text(f"-{dmg}", *cell_center(*pos), E_FIRE)
+def process_regen(grid):
+    engine.tick_regen(live_state(grid))
 
-        if card.hp <= 0:
-            grid.tiles[pos[0]][pos[1]].card = None
 
-        if t <= 0:
-            burn_effects.remove(eff)
+def process_burn(grid):
+    engine.tick_burn(live_state(grid))
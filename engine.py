@@ -0,0 +1,421 @@
+"""
+engine.py
+---------
+The game rules without pygame and without animations.
+
+A GameState is one game: the board, the flame / regen / burn lists,
+whose turn it is and its GameRNG (game_rng.py; damage rolls draw from
+the "combat" stream). The rules mutate it in place and publish what
+happened as typed events (events.py) on the state's EventBus instead of
+drawing anything; the GUI subscribes (effects.live_state) and turns
+them into floating texts and hit flashes.
+
+    state = GameState(grid)
+    state.bus.subscribe(DamageDealt, print)
+    for action in legal_actions(state): ...
+    apply(state, action)        # action + ACTION_FRAMES of effect ticks
+
+    snap = snapshot(state)      # branch / undo: restore(state, snap)
+
+Nothing here imports pygame, so headless simulations only pay for the
+rules.
+"""
+
+from typing import NamedTuple
+
+from actions import Move, Attack
+from aoe import AOE_EFFECTS, TRAIL_EAST, TRAIL_WEST
+from card import RARITY_MULT
+from config import FPS
+from game_rng import GameRNG
+import influence
+from events import (
+    EventBus, DamageDealt, ShieldAbsorbed, Healed, UnitHit, UnitDied, UnitMoved,
+    UnitPlaced, ActionPlayed, FlameSpawned, TrailCast, EffectApplied,
+)
+
+PLAYER, ENEMY = "player", "enemy"
+
+RULES_VERSION = 1  # bump when a rule change would replay old games differently
+
+FLAME_TICK_DMG = 5
+ACTION_FRAMES = 20  # frames one attack / move animation takes (0.05 per frame)
+
+
+class GameState:
+    def __init__(self, grid, flame_tiles=None, regen_effects=None, burn_effects=None,
+                 to_move=PLAYER, rng=None):
+        self.grid = grid
+        # flame_tiles:   [col, row, time_left, owner]
+        # regen_effects: [card, heal_per_tick, time_left, (col, row)]
+        # burn_effects:  [card, dmg_per_tick, time_left, (col, row)]
+        self.flame_tiles = [] if flame_tiles is None else flame_tiles
+        self.regen_effects = [] if regen_effects is None else regen_effects
+        self.burn_effects = [] if burn_effects is None else burn_effects
+        self.to_move = to_move
+        self.rng = GameRNG() if rng is None else rng
+        self.frame = 0
+        self.bus = EventBus()
+        self.influence = None  # influence.InfluenceMaps, built on first use
+
+    def winner(self):
+        grid = self.grid
+        if not grid.count(ENEMY):
+            return PLAYER
+        if not grid.count(PLAYER):
+            return ENEMY
+        return None
+
+
+def other_side(owner):
+    return PLAYER if owner == ENEMY else ENEMY
+
+
+# --------------------------------------------------
+# DAMAGE / DEATH
+# --------------------------------------------------
+def _kill_if_dead(state, card, c, r):
+    if card.hp <= 0:
+        if state.grid.card_at(c, r) is card:
+            state.grid.place(c, r, None)
+        state.bus.emit(UnitDied, card, (c, r))
+    influence.unit_changed(state, card)
+
+
+# --------------------------------------------------
+# ATTACK
+# --------------------------------------------------
+def _aoe_hits(grid, owner, effect, tc, tr):
+    """(x, y, card, "regen" | "burn") for every unit `effect` on (tc, tr) affects."""
+    for x, y, c in effect.shape.units(grid, tc, tr):
+        if c.owner != owner:
+            yield x, y, c, "burn"
+        elif not c.healed_once:
+            yield x, y, c, "regen"
+
+
+def healed_by(grid, ac, ar, tc, tr, atk):
+    """
+    The cards `atk` from (ac, ar) on (tc, tr) would start a regen on, as
+    attack() resolves it: an AoE heal in range, allies not yet healed.
+    """
+    attacker = grid.card_at(ac, ar)
+    effect = AOE_EFFECTS.get(atk.name)
+    if attacker is None or effect is None or abs(ac - tc) + abs(ar - tr) > atk.attack_range:
+        return []
+    return [c for _, _, c, kind in _aoe_hits(grid, attacker.owner, effect, tc, tr)
+            if kind == "regen"]
+
+
+def attack(state, ac, ar, tc, tr, atk):
+    """Resolve `atk` from (ac, ar) on (tc, tr): what perform_attack_logic does."""
+    grid = state.grid
+
+    # range safety check
+    dist = abs(ac - tc) + abs(ar - tr)
+    if dist > atk.attack_range:
+        return
+
+    attacker = grid.card_at(ac, ar)
+    target = grid.card_at(tc, tr)
+    if not attacker:
+        return
+
+    # damage base: falls off with distance, capped per hit
+    base_dmg = atk.dmg - dist
+    if target:
+        base_dmg = max(1, min(base_dmg, int(target.max_hp * 0.25)))
+
+    # 1. Burning Trail (fire): flames behind the caster, no friendly damage
+    if atk.name == "Burning Trail":
+        trail = TRAIL_EAST if tc > ac else TRAIL_WEST
+        for nc, nr in trail.cells(grid, ac, ar):
+            if not any(ft[0] == nc and ft[1] == nr for ft in state.flame_tiles):
+                state.flame_tiles.append([nc, nr, FPS * 3, attacker.owner])
+                influence.flame_added(state, nc, nr, attacker.owner)
+                state.bus.emit(FlameSpawned, (nc, nr), attacker.owner)
+        state.bus.emit(TrailCast, (ac, ar))
+
+        # upfront hit only if opponent
+        if target and target.owner != attacker.owner:
+            dmg = max(1, int(base_dmg * 0.5))
+            target.hp -= dmg
+            state.bus.emit(UnitHit, target, (tc, tr), "trail")
+            state.bus.emit(DamageDealt, target, dmg, (tc, tr), "trail")
+            _kill_if_dead(state, target, tc, tr)
+        return
+
+    # 2. AoE heal / burn: team safe, each card heals only once
+    effect = AOE_EFFECTS.get(atk.name)
+    if effect:
+        for x, y, c, kind in _aoe_hits(grid, attacker.owner, effect, tc, tr):
+            if kind == "regen":
+                state.regen_effects.append([c, effect.heal_per_tick, FPS * 2, (x, y)])
+                c.healed_once = True
+            else:
+                state.burn_effects.append([c, effect.burn_per_tick, FPS * 2, (x, y)])
+            state.bus.emit(EffectApplied, c, (x, y), effect, kind)
+        return
+
+    # 3. normal attack: no friendly fire, shields absorb first
+    if target and target.owner != attacker.owner:
+        base = atk.dmg + state.rng.combat.randint(-2, 2)
+        dmg = int(base * RARITY_MULT.get(attacker.rarity, 1.0))
+
+        if target.shield > 0:
+            absorbed = min(target.shield, dmg)
+            target.shield -= absorbed
+            dmg -= absorbed
+            state.bus.emit(ShieldAbsorbed, target, absorbed, (tc, tr))
+
+        if dmg > 0:
+            target.hp -= dmg
+            state.bus.emit(DamageDealt, target, dmg, (tc, tr), "normal")
+
+        state.bus.emit(UnitHit, target, (tc, tr), "normal")
+        _kill_if_dead(state, target, tc, tr)
+
+
+# --------------------------------------------------
+# MOVE
+# --------------------------------------------------
+def move(state, src, dst, card=None):
+    """
+    Move the card on src to the empty tile dst. With `card`, only if
+    that card is still the one on src (it may have died meanwhile).
+    """
+    grid = state.grid
+    mover = grid.card_at(*src)
+    if mover is None or (card is not None and mover is not card):
+        return False
+    if grid.card_at(*dst) is not None:
+        return False
+    grid.move_card(src, dst)
+    influence.unit_changed(state, mover)
+    state.bus.emit(UnitMoved, mover, src, dst)
+    return True
+
+
+def place(state, c, r, card):
+    """Put a new card on the empty tile (c, r) (placement phase)."""
+    state.grid.place(c, r, card)
+    influence.unit_changed(state, card)
+    state.bus.emit(UnitPlaced, card, (c, r))
+
+
+def play(state, action):
+    """
+    Resolve a Move / Attack now, without effect ticks. ActionPlayed is
+    published for actions that were played (the mover / attacker is
+    still on action.src and a move's tile is free).
+    """
+    card = state.grid.card_at(*action.src)
+    if card is None:
+        return False
+    if isinstance(action, Move):
+        if not move(state, action.src, action.dst):
+            return False
+    else:
+        atk = card.attacks[action.attack_idx]
+        attack(state, action.src[0], action.src[1], action.dst[0], action.dst[1], atk)
+    state.bus.emit(ActionPlayed, action, state.frame)
+    return True
+
+
+# --------------------------------------------------
+# EFFECT TICKS (once per frame)
+# --------------------------------------------------
+def tick_flames(state):
+    """Flames burn opponents of their owner standing on them (can kill)."""
+    grid = state.grid
+    for ft in state.flame_tiles[:]:
+        c, r, t, owner = ft
+        t -= 1
+        ft[2] = t
+
+        if t <= 0:
+            state.flame_tiles.remove(ft)
+            influence.flame_removed(state, c, r, owner)
+            continue
+
+        if not grid.in_bounds(c, r):
+            continue
+
+        card = grid.card_at(c, r)
+        if card and card.owner != owner:
+            card.hp -= FLAME_TICK_DMG
+            state.bus.emit(DamageDealt, card, FLAME_TICK_DMG, (c, r), "flame")
+            _kill_if_dead(state, card, c, r)
+
+
+def tick_regen(state):
+    """Heal over time, capped at max_hp."""
+    for eff in state.regen_effects[:]:
+        card, heal, t, pos = eff
+        t -= 1
+        eff[2] = t
+
+        # card might already be dead
+        if card.hp <= 0:
+            state.regen_effects.remove(eff)
+            continue
+
+        card.hp = min(card.max_hp, card.hp + heal)
+        if state.bus.wants(Healed):
+            state.bus.emit(Healed, card, heal, state.grid.position_of(card) or pos)
+        influence.unit_changed(state, card)
+
+        if t <= 0:
+            state.regen_effects.remove(eff)
+
+
+def tick_burn(state):
+    """Damage over time (can kill)."""
+    for eff in state.burn_effects[:]:
+        card, dmg, t, pos = eff
+        t -= 1
+        eff[2] = t
+
+        # card might already be dead
+        if card.hp <= 0:
+            state.burn_effects.remove(eff)
+            continue
+
+        card.hp -= dmg
+        c, r = state.grid.position_of(card) or pos
+        state.bus.emit(DamageDealt, card, dmg, (c, r), "burn")
+        _kill_if_dead(state, card, c, r)
+
+        if t <= 0:
+            state.burn_effects.remove(eff)
+
+
+def tick(state, frames=1):
+    """Run `frames` frames of effects in the main loop's order."""
+    for done in range(frames):
+        if not (state.flame_tiles or state.regen_effects or state.burn_effects):
+            # nothing left to tick: skip ahead
+            state.frame += frames - done
+            return
+        tick_flames(state)
+        tick_regen(state)
+        tick_burn(state)
+        state.frame += 1
+
+
+# --------------------------------------------------
+# SNAPSHOT / RESTORE
+# --------------------------------------------------
+class Snapshot(NamedTuple):
+    units: tuple    # (card, c, r, hp, shield, healed_once) per card on the board
+    flames: tuple   # (c, r, time_left, owner)
+    regen: tuple    # (card, heal_per_tick, time_left, (c, r))
+    burn: tuple     # (card, dmg_per_tick, time_left, (c, r))
+    to_move: str
+    frame: int
+    rng: tuple = None   # GameRNG.getstate(), only with snapshot(..., rng=True)
+
+
+def snapshot(state, rng=False):
+    """
+    Immutable record of everything the rules read: who stands where, their
+    hp / shield / healed_once, the effect lists, the turn and the frame.
+    Cards are kept by reference (their attacks / owner never change), so
+    a snapshot costs a few tuples per unit instead of a deep copy.
+    """
+    return Snapshot(
+        tuple((card, c, r, card.hp, card.shield, card.healed_once)
+              for c, r, card in state.grid.occupied()),
+        tuple(map(tuple, state.flame_tiles)),
+        tuple(map(tuple, state.regen_effects)),
+        tuple(map(tuple, state.burn_effects)),
+        state.to_move,
+        state.frame,
+        state.rng.getstate() if rng else None,
+    )
+
+
+def restore(state, snap):
+    """
+    Put `state` back to `snap` in place. Only tiles whose card differs are
+    touched, so the grid's caches and listeners see the real changes; the
+    effect lists are refilled in place (whoever holds them sees the change).
+    """
+    grid = state.grid
+    wanted = {id(u[0]): (u[1], u[2]) for u in snap.units}
+
+    gone = []
+    for c, r, card in list(grid.occupied()):
+        if wanted.get(id(card)) != (c, r):
+            grid.place(c, r, None)
+            gone.append(card)
+
+    for card, c, r, hp, shield, healed in snap.units:
+        moved = grid.card_at(c, r) is not card
+        if moved:
+            grid.place(c, r, card)
+        if moved or card.hp != hp or card.shield != shield:
+            card.hp = hp
+            card.shield = shield
+            influence.unit_changed(state, card)
+        card.healed_once = healed
+    for card in gone:
+        if id(card) not in wanted:
+            influence.unit_changed(state, card)
+
+    # influence only counts flames per tile, not their timers
+    old_flames = [(f[0], f[1], f[3]) for f in state.flame_tiles]
+    new_flames = [(f[0], f[1], f[3]) for f in snap.flames]
+    if old_flames != new_flames:
+        for c, r, owner in old_flames:
+            influence.flame_removed(state, c, r, owner)
+        for c, r, owner in new_flames:
+            influence.flame_added(state, c, r, owner)
+    state.flame_tiles[:] = [list(f) for f in snap.flames]
+
+    state.regen_effects[:] = [list(e) for e in snap.regen]
+    state.burn_effects[:] = [list(e) for e in snap.burn]
+    state.to_move = snap.to_move
+    state.frame = snap.frame
+    if snap.rng is not None:
+        state.rng.setstate(snap.rng)
+
+
+# --------------------------------------------------
+# TURNS
+# --------------------------------------------------
+def legal_actions(state):
+    """Every Move / Attack the side to move can play."""
+    grid = state.grid
+    side = state.to_move
+    board = list(grid.occupied())
+    out = []
+    for uc, ur in grid.units(side):
+        card = grid.card_at(uc, ur)
+
+        for a_idx, atk in enumerate(card.attacks):
+            aoe = atk.name in AOE_EFFECTS
+            for c, r, other in board:
+                if not aoe and other.owner == side:
+                    continue
+                if abs(uc - c) + abs(ur - r) <= atk.attack_range:
+                    out.append(Attack((uc, ur), a_idx, (c, r)))
+
+        # reach.moves only walks empty tiles; the one occupied tile is the origin
+        for dst in sorted(grid.reach.moves((uc, ur), card.move_range)):
+            if dst != (uc, ur):
+                out.append(Move((uc, ur), dst))
+    return out
+
+
+def apply(state, action, frames=ACTION_FRAMES):
+    """
+    Play `action` for the side to move, then `frames` frames of effect
+    ticks (the time its animation takes in the GUI), and pass the turn.
+    Mutates and returns `state`.
+    """
+    if action is not None:
+        play(state, action)
+    tick(state, frames)
+    state.to_move = other_side(state.to_move)
+    return state
@@ -0,0 +1,105 @@
+"""
+Typed events the rules engine publishes and a bus to subscribe to them.
+
+Positions are (col, row) tiles. `cause` on DamageDealt / UnitHit is
+"normal", "trail", "flame" or "burn"; `kind` on EffectApplied is
+"regen" or "burn".
+
+Subscribers register per event type, and the engine only builds an
+event when something is subscribed to its type, so a headless game
+with an empty bus pays one dict lookup per would-be event.
+"""
+
+from typing import Any, NamedTuple, Tuple
+
+
+class DamageDealt(NamedTuple):
+    card: Any
+    amount: int
+    pos: Tuple[int, int]
+    cause: str
+
+
+class ShieldAbsorbed(NamedTuple):
+    card: Any
+    amount: int
+    pos: Tuple[int, int]
+
+
+class Healed(NamedTuple):
+    card: Any
+    amount: int
+    pos: Tuple[int, int]
+
+
+class UnitHit(NamedTuple):
+    card: Any
+    pos: Tuple[int, int]
+    cause: str
+
+
+class UnitDied(NamedTuple):
+    card: Any
+    pos: Tuple[int, int]
+
+
+class UnitMoved(NamedTuple):
+    card: Any
+    src: Tuple[int, int]
+    dst: Tuple[int, int]
+
+
+class UnitPlaced(NamedTuple):
+    card: Any
+    pos: Tuple[int, int]
+
+
+class ActionPlayed(NamedTuple):
+    action: Any     # actions.Move / actions.Attack
+    frame: int      # GameState.frame it resolved on
+
+
+class FlameSpawned(NamedTuple):
+    pos: Tuple[int, int]
+    owner: str
+
+
+class TrailCast(NamedTuple):
+    pos: Tuple[int, int]
+
+
+class EffectApplied(NamedTuple):
+    card: Any
+    pos: Tuple[int, int]
+    effect: Any     # aoe.AoeEffect
+    kind: str
+
+
+class EventBus:
+    def __init__(self):
+        self._handlers = {}  # event type -> [fn]
+
+    def subscribe(self, event_type, fn):
+        self._handlers.setdefault(event_type, []).append(fn)
+
+    def unsubscribe(self, event_type, fn):
+        handlers = self._handlers.get(event_type)
+        if handlers and fn in handlers:
+            handlers.remove(fn)
+            if not handlers:
+                del self._handlers[event_type]
+
+    def wants(self, event_type):
+        return event_type in self._handlers
+
+    def emit(self, event_type, *args):
+        """Build event_type(*args) and deliver it, if anyone listens."""
+        handlers = self._handlers.get(event_type)
+        if handlers:
+            event = event_type(*args)
+            for fn in handlers:
+                fn(event)
+
+    def publish(self, event):
+        for fn in self._handlers.get(type(event), ()):
+            fn(event)
@@ -0,0 +1,81 @@
+"""
+game_rng.py
+-----------
+Seedable per-game randomness split into named streams, so one game's
+draws never depend on another's and a match seed plus the actions
+played reproduces the whole game.
+
+    rng = GameRNG(1234)
+    rng.combat.randint(-2, 2)   # damage variance (engine.attack)
+    rng.spawn.choice(empties)   # enemy elements and placement (main.py)
+    rng.ai.choice(players)      # CPU tie-breaks (greedy_fire_spread)
+    rng.seed_for("mcts")        # seeds of the search CPUs (search_turn.py)
+
+Each stream is its own random.Random, seeded from (game seed, stream
+name) with sha256, so adding draws to one stream never shifts another,
+and the derivation is the same in every process (no hash()
+randomisation).
+
+GameRNG.for_grid(grid) finds the game's rng. A WeakKeyDictionary is
+enough for that: unlike a GameState, the rng holds nothing that leads
+back to the grid.
+"""
+
+import random
+import weakref
+from hashlib import sha256
+
+STREAMS = ("combat", "spawn", "ai")
+
+_rng_by_grid = weakref.WeakKeyDictionary()
+
+
+def derive_seed(seed, name):
+    """64-bit seed for `name` under `seed`, stable across processes."""
+    digest = sha256(f"{seed}/{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+class GameRNG:
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self._streams = {}
+
+    @classmethod
+    def for_grid(cls, grid, seed=None):
+        """The rng of the game played on `grid`, created with `seed` on first use."""
+        rng = _rng_by_grid.get(grid)
+        if rng is None:
+            rng = _rng_by_grid[grid] = cls(seed)
+        return rng
+
+    def stream(self, name):
+        s = self._streams.get(name)
+        if s is None:
+            s = self._streams[name] = random.Random(derive_seed(self.seed, name))
+        return s
+
+    @property
+    def combat(self):
+        return self.stream("combat")
+
+    @property
+    def spawn(self):
+        return self.stream("spawn")
+
+    @property
+    def ai(self):
+        return self.stream("ai")
+
+    def seed_for(self, name):
+        """A seed for a component that keeps its own Random (search CPUs)."""
+        return derive_seed(self.seed, name)
+
+    def getstate(self):
+        return tuple((name, s.getstate()) for name, s in self._streams.items())
+
+    def setstate(self, state):
+        for name, s in state:
+            self.stream(name).setstate(s)
@@ -3,20 +3,375 @@ Grid is treated as an implicit unweighted graph:
 - Each tile is a node
 - Adjacent tiles are edges
 - BFS is used for movement and attack range evaluation
+
+Storage is a flat occupancy array of card ids (column-major,
+idx = c * rows + r) plus a side table of cards. `grid.tiles[c][r].card`
+still works through a lightweight view so older call sites keep running,
+but hot paths should use `card_at` / `place` / `occupied`.
 """
 
-from card import Tile
-from config import TILE_SIZE
+from array import array
+from functools import lru_cache
+from itertools import compress
+
+from bitboard import BITBOARD_MAX_TILES, BoardBits, layout
+from config import TILE_SIZE, SPARSE_GRID_THRESHOLD, CHUNK_SIZE
+
+EMPTY = 0  # card id 0 means "no card"
+
+
+# --------------------------------------------------
+# COMPATIBILITY VIEW: grid.tiles[c][r].card
+# --------------------------------------------------
+class TileView:
+    __slots__ = ("grid", "col", "row")
+
+    def __init__(self, grid, col, row):
+        self.grid = grid
+        self.col = col
+        self.row = row
+
+    @property
+    def card(self):
+        return self.grid.card_at(self.col, self.row)
+
+    @card.setter
+    def card(self, card):
+        self.grid.place(self.col, self.row, card)
+
+
+class _ColumnView:
+    __slots__ = ("grid", "col")
+
+    def __init__(self, grid, col):
+        self.grid = grid
+        self.col = col
+
+    def __len__(self):
+        return self.grid.rows
+
+    def __getitem__(self, r):
+        rows = self.grid.rows
+        if r < 0:
+            r += rows
+        if not 0 <= r < rows:
+            raise IndexError("tile row out of range")
+        return TileView(self.grid, self.col, r)
 
+    def __iter__(self):
+        for r in range(self.grid.rows):
+            yield TileView(self.grid, self.col, r)
+
+
+class TilesView:
+    __slots__ = ("grid",)
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __getitem__(self, c):
+        cols = self.grid.cols
+        if c < 0:
+            c += cols
+        if not 0 <= c < cols:
+            raise IndexError("tile column out of range")
+        return _ColumnView(self.grid, c)
+
+    def __iter__(self):
+        for c in range(self.grid.cols):
+            yield _ColumnView(self.grid, c)
+
+
+# --------------------------------------------------
+# GRID
+# --------------------------------------------------
 class Grid:
+    sparse = False
+
     def __init__(self, cols, rows):
         self.cols = cols
         self.rows = rows
-        self.tiles = [[Tile(c, r) for r in range(rows)] for c in range(cols)]
-    
+
+        # occupancy: one unsigned int per tile, EMPTY or a card id
+        self.cells = self._new_cells()
+
+        # side table: card id -> card / flat index (slot 0 is EMPTY)
+        self.cards = [None]
+        self._pos = [-1]
+        self._free = []
+        self._ids = {}  # id(card) -> card id
+
+        # unit registry: (owner, index) -> card id, owner -> card ids
+        self._units = {}
+        self._by_owner = {}
+
+        # bumped on every occupancy change; listeners get (c, r)
+        self.version = 0
+        self._listeners = []
+        self._reach = None
+        self._paths = None
+        self._bits = None  # (version, BoardBits)
+
+        # the game played on this grid, kept here rather than in a
+        # dict keyed by the grid (both hold the grid, so such an entry
+        # would never be freed): effects.live_state, CPUMemory.for_grid
+        self.game = None
+        self.cpu_memory = None
+
+        self.tiles = TilesView(self)
+
+    def _new_cells(self):
+        return array("I", bytes(4 * self.cols * self.rows))
+
     def in_bounds(self, c, r):
         return 0 <= c < self.cols and 0 <= r < self.rows
 
+    @property
+    def neighbors(self):
+        # built lazily: big boards that never run a BFS don't pay for it
+        return neighbor_table(self.cols, self.rows)
+
+    @property
+    def reach(self):
+        """Obstacle-aware movement ranges, cached until a move touches them."""
+        if self._reach is None:
+            from pathing import Reachability
+            self._reach = Reachability(self)
+        return self._reach
+
+    @property
+    def paths(self):
+        """A* paths through empty tiles, LRU-cached per occupancy version."""
+        if self._paths is None:
+            from pathing import PathFinder
+            self._paths = PathFinder(self)
+        return self._paths
+
+    @property
+    def use_bits(self):
+        return not self.sparse and self.cols * self.rows <= BITBOARD_MAX_TILES
+
+    def bits(self):
+        """Occupancy / ownership bitboards, rebuilt only after a change."""
+        if self._bits is None or self._bits[0] != self.version:
+            self._bits = (self.version, BoardBits(self))
+        return self._bits[1]
+
+    def add_listener(self, fn):
+        self._listeners.append(fn)
+
+    def card_at(self, c, r):
+        return self.cards[self.cells[c * self.rows + r]]
+
+    def place(self, c, r, card):
+        """
+        Put `card` on (c, r), or clear the tile when card is None.
+        A card can only sit on one tile: placing a card that is already
+        on the board moves it.
+        """
+        i = c * self.rows + r
+        old = self.cells[i]
+        if old:
+            if self.cards[old] is card:
+                return
+            self._release(old)
+
+        if card is None:
+            self.cells[i] = EMPTY
+            self._changed(i)
+            return
+
+        cid = self._ids.get(id(card))
+        if cid is None:
+            cid = self._alloc(card)
+        else:
+            src = self._pos[cid]
+            self.cells[src] = EMPTY
+            self._changed(src)
+
+        self._pos[cid] = i
+        self.cells[i] = cid
+        self._changed(i)
+
+    def move_card(self, src, dst):
+        """Moves whatever card stands on src to dst; returns it (or None)."""
+        card = self.card_at(*src)
+        if card is not None:
+            self.place(dst[0], dst[1], card)
+        return card
+
+    def position_of(self, card):
+        cid = self._ids.get(id(card))
+        if cid is None:
+            return None
+        return divmod(self._pos[cid], self.rows)
+
+    # ------------------------------
+    # unit registry queries
+    # ------------------------------
+    def find(self, owner, index):
+        """Position of the `owner` card with this slot index, or None."""
+        cid = self._units.get((owner, index))
+        if cid is None:
+            return None
+        return divmod(self._pos[cid], self.rows)
+
+    def units(self, owner):
+        """Positions of all `owner` cards, in column-major scan order."""
+        pos = self._pos
+        rows = self.rows
+        return [
+            divmod(i, rows)
+            for i in sorted(pos[cid] for cid in self._by_owner.get(owner, ()))
+        ]
+
+    def count(self, owner):
+        return len(self._by_owner.get(owner, ()))
+
+    def owners(self):
+        return [owner for owner, cids in self._by_owner.items() if cids]
+
+    def occupied(self):
+        """
+        Yields (c, r, card) for every occupied tile in column-major order
+        (the same order as the classic `for c: for r:` scans).
+        Walks the side table, so the cost grows with the number of cards,
+        not with the board size.
+        """
+        rows = self.rows
+        cells = self.cells
+        cards = self.cards
+        for i in sorted(compress(self._pos, self.cards)):
+            c, r = divmod(i, rows)
+            yield c, r, cards[cells[i]]
+
+    # ------------------------------
+    # card id bookkeeping
+    # ------------------------------
+    def _changed(self, i):
+        self.version += 1
+        if self._listeners:
+            c, r = divmod(i, self.rows)
+            for fn in self._listeners:
+                fn(c, r)
+
+    def _alloc(self, card):
+        if self._free:
+            cid = self._free.pop()
+            self.cards[cid] = card
+        else:
+            cid = len(self.cards)
+            self.cards.append(card)
+            self._pos.append(-1)
+        self._ids[id(card)] = cid
+        self._units[(card.owner, card.index)] = cid
+        self._by_owner.setdefault(card.owner, set()).add(cid)
+        return cid
+
+    def _release(self, cid):
+        card = self.cards[cid]
+        del self._ids[id(card)]
+        if self._units.get((card.owner, card.index)) == cid:
+            del self._units[(card.owner, card.index)]
+        self._by_owner[card.owner].discard(cid)
+        self.cards[cid] = None
+        self._pos[cid] = -1
+        self._free.append(cid)
+
+
+# --------------------------------------------------
+# SPARSE GRID: only chunks that hold cards exist
+# --------------------------------------------------
+class ChunkedCells:
+    """
+    Stands in for the flat occupancy array (same flat indices) but only
+    allocates CHUNK_SIZE x CHUNK_SIZE blocks that hold at least one card.
+    Empty blocks are dropped again as soon as their last card leaves.
+    """
+
+    def __init__(self, cols, rows, chunk=CHUNK_SIZE):
+        self.cols = cols
+        self.rows = rows
+        self.chunk = chunk
+        self._chunks = {}  # (chunk_col, chunk_row) -> [array, card count]
+
+    def __len__(self):
+        return self.cols * self.rows
+
+    def _locate(self, i):
+        c, r = divmod(i, self.rows)
+        ch = self.chunk
+        return (c // ch, r // ch), (c % ch) * ch + (r % ch)
+
+    def __getitem__(self, i):
+        key, j = self._locate(i)
+        block = self._chunks.get(key)
+        return block[0][j] if block else EMPTY
+
+    def __setitem__(self, i, cid):
+        key, j = self._locate(i)
+        block = self._chunks.get(key)
+        if block is None:
+            if not cid:
+                return
+            block = self._chunks[key] = [array("I", bytes(4 * self.chunk * self.chunk)), 0]
+
+        cells = block[0]
+        if cid and not cells[j]:
+            block[1] += 1
+        elif not cid and cells[j]:
+            block[1] -= 1
+        cells[j] = cid
+
+        if not block[1]:
+            del self._chunks[key]
+
+    @property
+    def chunk_count(self):
+        return len(self._chunks)
+
+
+class _ComputedNeighbors:
+    """neighbor_table() computed on lookup, for boards too big to tabulate."""
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+
+    def __getitem__(self, i):
+        cols, rows = self.cols, self.rows
+        c, r = divmod(i, rows)
+        return tuple(
+            (c + dc) * rows + (r + dr)
+            for dc, dr in NEIGHBOR_DIRS
+            if 0 <= c + dc < cols and 0 <= r + dr < rows
+        )
+
+
+class SparseGrid(Grid):
+    """
+    Same API as Grid for very large or mostly empty arenas: memory grows
+    with the number of occupied chunks instead of cols * rows.
+    """
+    sparse = True
+
+    def _new_cells(self):
+        return ChunkedCells(self.cols, self.rows)
+
+    @property
+    def neighbors(self):
+        return _ComputedNeighbors(self.cols, self.rows)
+
+
+def make_grid(cols, rows):
+    if cols * rows > SPARSE_GRID_THRESHOLD:
+        return SparseGrid(cols, rows)
+    return Grid(cols, rows)
+
+
 def cell_center(c, r):
     return c * TILE_SIZE + TILE_SIZE // 2, r * TILE_SIZE + TILE_SIZE // 2
 
@@ -24,34 +379,123 @@ def get_neighbors(c, r, grid):
     """
     Graph adjacency: returns neighboring nodes (up, down, left, right)
     """
-    neighbors = []
-    for dc, dr in [(1,0), (-1,0), (0,1), (0,-1)]:
-        nc, nr = c + dc, r + dr
-        if grid.in_bounds(nc, nr):
-            neighbors.append((nc, nr))
-    return neighbors
+    rows = grid.rows
+    return [divmod(n, rows) for n in grid.neighbors[c * rows + r]]
+
+
+# --------------------------------------------------
+# RANGE QUERIES
+# --------------------------------------------------
+NEIGHBOR_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+@lru_cache(maxsize=8)
+def neighbor_table(cols, rows):
+    """
+    Flat adjacency for a cols x rows board: table[i] is a tuple of the
+    flat indices next to i, in NEIGHBOR_DIRS order. Built once per size.
+    """
+    table = []
+    for c in range(cols):
+        for r in range(rows):
+            table.append(tuple(
+                (c + dc) * rows + (r + dr)
+                for dc, dr in NEIGHBOR_DIRS
+                if 0 <= c + dc < cols and 0 <= r + dr < rows
+            ))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def ball_offsets(radius):
+    """
+    (dc, dr) offsets of the Manhattan diamond of `radius`, ring by ring
+    (distance 0 first).
+    """
+    offsets = [(0, 0)]
+    for d in range(1, radius + 1):
+        for dc in range(-d, d + 1):
+            dr = d - abs(dc)
+            offsets.append((dc, dr))
+            if dr:
+                offsets.append((dc, -dr))
+    return tuple(offsets)
 
-from collections import deque
 
-def bfs_reachable(start, max_depth, grid):
+def bfs_reachable(start, max_depth, grid, blocked=None):
     """
-    Graph traversal (BFS) to find reachable nodes within depth
+    Graph traversal (BFS) to find reachable nodes within depth.
+
+    Without obstacles the answer is the Manhattan diamond clipped to the
+    board, so it is read straight from the cached offsets. `blocked` is
+    an optional collection of (c, r) tiles that cannot be entered; the
+    start tile is always reachable.
     """
-    visited = set()
-    queue = deque([(start, 0)])
-    reachable = set()
+    sc, sr = start
+    if not blocked:
+        cols, rows = grid.cols, grid.rows
+        return {
+            (sc + dc, sr + dr)
+            for dc, dr in ball_offsets(max_depth)
+            if 0 <= sc + dc < cols and 0 <= sr + dr < rows
+        }
 
-    while queue:
-        (c, r), d = queue.popleft()
-        if d > max_depth:
-            continue
+    if grid.use_bits:
+        lay = layout(grid.cols, grid.rows)
+        origin = lay.bit(sc, sr)
+        walls = lay.from_positions(blocked) & ~origin
+        return set(lay.positions(lay.reachable(origin, max_depth, walls)))
 
-        reachable.add((c, r))
+    rows = grid.rows
+    neighbors = grid.neighbors
+    walls = {c * rows + r for c, r in blocked}
+
+    origin = sc * rows + sr
+    seen = {origin}
+    frontier = [origin]
+    for _ in range(max_depth):
+        nxt = []
+        for i in frontier:
+            for n in neighbors[i]:
+                if n not in seen and n not in walls:
+                    seen.add(n)
+                    nxt.append(n)
+        if not nxt:
+            break
+        frontier = nxt
+
+    return {divmod(i, rows) for i in seen}
+
+
+def bfs_open(start, max_depth, grid):
+    """
+    BFS that only walks through empty tiles (the start tile is allowed
+    to be occupied: it is the unit that is moving). Reads the occupancy
+    array directly, so no blocked set has to be built.
+    """
+    sc, sr = start
+    if grid.use_bits:
+        lay = layout(grid.cols, grid.rows)
+        origin = lay.bit(sc, sr)
+        walls = grid.bits().occupied & ~origin
+        return set(lay.positions(lay.reachable(origin, max_depth, walls)))
 
-        for nc, nr in get_neighbors(c, r, grid):
-            if (nc, nr) not in visited:
-                visited.add((nc, nr))
-                queue.append(((nc, nr), d + 1))
+    rows = grid.rows
+    cells = grid.cells
+    neighbors = grid.neighbors
 
-    return reachable
+    origin = sc * rows + sr
+    seen = {origin}
+    frontier = [origin]
+    for _ in range(max_depth):
+        nxt = []
+        for i in frontier:
+            for n in neighbors[i]:
+                if n not in seen and not cells[n]:
+                    seen.add(n)
+                    nxt.append(n)
+        if not nxt:
+            break
+        frontier = nxt
 
+    return {divmod(i, rows) for i in seen}
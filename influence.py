@@ -0,0 +1,140 @@
+"""
+Influence maps: who controls which part of the board, kept up to date
+incrementally instead of being re-derived by every CPU heuristic.
+
+Each unit stamps a diamond of radius = its longest attack range onto
+its owner's control map, weighted by its strongest attack and current
+hp ratio and fading linearly with distance. Flame tiles are counted per
+owner. When a unit moves, is damaged / healed or dies, only its own old
+stamp is subtracted and the new one added.
+
+The maps of a game live on its engine.GameState (state.influence).
+The rules report changes through the hooks at the bottom (unit_changed,
+flame_added, flame_removed), which only touch that game's maps and are
+no-ops until someone asks for them with InfluenceMaps.for_state(state).
+"""
+
+from grid import ball_offsets
+
+
+def _stamp(card):
+    radius = max((a.attack_range for a in card.attacks), default=0)
+    power = max((a.dmg for a in card.attacks), default=0)
+    strength = power * max(card.hp, 0) / card.max_hp
+    return radius, strength
+
+
+class InfluenceMaps:
+    def __init__(self, grid, flame_tiles=()):
+        self.grid = grid
+        self.control = {}   # owner -> {(c, r): influence}
+        self.flames = {}    # owner -> {(c, r): active flame count}
+        self._units = {}    # id(card) -> (card, pos, radius, strength)
+
+        for c, r, card in grid.occupied():
+            self._add(card, (c, r))
+        for ft in flame_tiles:
+            self.flame(ft[0], ft[1], ft[3], 1)
+
+    @classmethod
+    def for_state(cls, state):
+        """The game's maps, built from its current board on first use."""
+        if state.influence is None:
+            state.influence = cls(state.grid, state.flame_tiles)
+        return state.influence
+
+    # ------------------------------
+    # READS
+    # ------------------------------
+    def control_at(self, owner, pos):
+        return self.control.get(owner, {}).get(pos, 0.0)
+
+    def flame_danger(self, owner, pos):
+        """Damage per tick opposing flames would deal to `owner` on pos."""
+        from engine import FLAME_TICK_DMG  # engine imports this module
+
+        return sum(
+            layer.get(pos, 0) for other, layer in self.flames.items()
+            if other != owner
+        ) * FLAME_TICK_DMG
+
+    def danger(self, owner, pos):
+        """Opposing influence plus opposing flame damage per tick on pos."""
+        total = self.flame_danger(owner, pos)
+        for other, layer in self.control.items():
+            if other != owner:
+                total += layer.get(pos, 0.0)
+        return total
+
+    def balance(self, owner, pos):
+        """> 0 where `owner` dominates, < 0 where the opponents do."""
+        return 2 * self.control_at(owner, pos) - sum(
+            layer.get(pos, 0.0) for layer in self.control.values()
+        )
+
+    # ------------------------------
+    # UPDATES
+    # ------------------------------
+    def refresh(self, card):
+        pos = self.grid.position_of(card)
+        old = self._units.get(id(card))
+        if old and old[1] == pos and _stamp(card) == old[2:]:
+            return
+        if old:
+            self._remove(card)
+        if pos is not None and card.hp > 0:
+            self._add(card, pos)
+
+    def flame(self, c, r, owner, delta):
+        if not self.grid.in_bounds(c, r):
+            return
+        layer = self.flames.setdefault(owner, {})
+        count = layer.get((c, r), 0) + delta
+        if count > 0:
+            layer[(c, r)] = count
+        else:
+            layer.pop((c, r), None)
+
+    def _add(self, card, pos):
+        radius, strength = _stamp(card)
+        self._units[id(card)] = (card, pos, radius, strength)
+        self._apply(card.owner, pos, radius, strength)
+
+    def _remove(self, card):
+        _, pos, radius, strength = self._units.pop(id(card))
+        self._apply(card.owner, pos, radius, -strength)
+
+    def _apply(self, owner, pos, radius, strength):
+        if not strength:
+            return
+        layer = self.control.setdefault(owner, {})
+        cols, rows = self.grid.cols, self.grid.rows
+        pc, pr = pos
+        for dc, dr in ball_offsets(radius):
+            c, r = pc + dc, pr + dr
+            if 0 <= c < cols and 0 <= r < rows:
+                w = strength * (radius + 1 - abs(dc) - abs(dr)) / (radius + 1)
+                value = layer.get((c, r), 0.0) + w
+                if abs(value) < 1e-9:
+                    layer.pop((c, r), None)
+                else:
+                    layer[(c, r)] = value
+
+
+# --------------------------------------------------
+# HOOKS (called from the rules code)
+# --------------------------------------------------
+def unit_changed(state, card):
+    """A card of `state`'s game moved, lost / gained hp or died."""
+    if state.influence is not None:
+        state.influence.refresh(card)
+
+
+def flame_added(state, c, r, owner):
+    if state.influence is not None:
+        state.influence.flame(c, r, owner, 1)
+
+
+def flame_removed(state, c, r, owner):
+    if state.influence is not None:
+        state.influence.flame(c, r, owner, -1)
@@ -0,0 +1,271 @@
+"""
+alphabeta.py
+------------
+Depth-limited alpha-beta (negamax) CPU over the rules in engine.py.
+
+The root SimState is loaded into simulation's scratch GameState once;
+every node then plays its action with engine.apply and takes it back
+with engine.snapshot / restore, so the search allocates no SimStates.
+
+- Zobrist hashing of the board: unit positions, hp buckets, shields,
+  healed_once, active flames and regen / burn effects, side to move
+- bounded transposition table shared across turns
+- iterative deepening under a time budget; move ordering puts the TT
+  move first, then the move the greedy heuristics would play, then
+  attacks by expected damage and approaches before retreats
+- nodes / sec of the last search in AlphaBetaCPU.last_stats
+"""
+
+import random
+import time
+
+from actions import Attack
+from config import SEARCH_DEPTH, SEARCH_TIME_MS
+from engine import snapshot, restore, apply, legal_actions, other_side
+from logic_cpu.search_turn import search_cpu_turn, searcher_stats
+from logic_cpu.simulation import ENEMY, TICKS_PER_TURN, greedy_action, sim_game
+
+HP_BUCKET = 10
+SHIELD_BUCKET = 5
+TICK_BUCKET = TICKS_PER_TURN
+TT_MAX_ENTRIES = 200_000
+WIN_SCORE = 100_000
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class Zobrist:
+    """Random 64-bit keys per board feature, created on first use."""
+
+    def __init__(self, seed=0x5EED):
+        self._rng = random.Random(seed)
+        self._keys = {}
+
+    def key(self, *feature):
+        k = self._keys.get(feature)
+        if k is None:
+            k = self._keys[feature] = self._rng.getrandbits(64)
+        return k
+
+    def hash(self, game):
+        """Hash of an engine.GameState."""
+        key = self.key
+        h = key("to_move", game.to_move)
+        for c, r, card in game.grid.occupied():
+            ident = (card.owner, card.index)
+            h ^= key("pos", ident, (c, r))
+            h ^= key("hp", ident, card.hp // HP_BUCKET)
+            if card.shield:
+                h ^= key("shield", ident, card.shield // SHIELD_BUCKET)
+            if card.healed_once:
+                h ^= key("healed", ident)
+        for c, r, t, owner in game.flame_tiles:
+            h ^= key("flame", c, r, owner, t // TICK_BUCKET)
+        for kind, effects in (("regen", game.regen_effects), ("burn", game.burn_effects)):
+            for card, per_tick, t, _pos in effects:
+                if card.hp > 0:
+                    h ^= key("effect", kind, (card.owner, card.index), per_tick,
+                             t // TICK_BUCKET)
+        return h
+
+
+class _Timeout(Exception):
+    pass
+
+
+# --------------------------------------------------
+# EVALUATION
+# --------------------------------------------------
+def evaluate(game):
+    """Material of an engine.GameState from the point of view of the side to move."""
+    to_move = game.to_move
+    winner = game.winner()
+    if winner is not None:
+        return WIN_SCORE if winner == to_move else -WIN_SCORE
+
+    score = 0
+    for _c, _r, card in game.grid.occupied():
+        value = card.hp + card.shield + 50
+        score += value if card.owner == to_move else -value
+
+    # pending regen / burn are as good as done
+    for sign, effects in ((1, game.regen_effects), (-1, game.burn_effects)):
+        for card, per_tick, t, _pos in effects:
+            if card.hp > 0:
+                amount = sign * per_tick * t
+                score += amount if card.owner == to_move else -amount
+    return score
+
+
+def _order_score(game, action, seed, opp):
+    """opp: positions of the side not to move (read once per node)."""
+    if action == seed:
+        return 1_000_000
+    grid = game.grid
+    if isinstance(action, Attack):
+        atk = grid.card_at(*action.src).attacks[action.attack_idx]
+        target = grid.card_at(*action.dst)
+        kill = 1000 if target and target.owner != game.to_move and atk.dmg >= target.hp else 0
+        return 10_000 + kill + atk.dmg
+    # moves: closer to the nearest opponent first
+    if not opp:
+        return 0
+    c, r = action.dst
+    return -min(abs(c - oc) + abs(r - orow) for oc, orow in opp)
+
+
+# --------------------------------------------------
+# SEARCH
+# --------------------------------------------------
+class AlphaBetaCPU:
+    def __init__(self, max_depth=SEARCH_DEPTH, time_ms=SEARCH_TIME_MS):
+        self.max_depth = max_depth
+        self.time_ms = time_ms
+        self.zobrist = Zobrist()
+        self.tt = {}  # hash -> (depth, value, flag, best action)
+        self.last_stats = {}
+
+    def choose(self, state, seed=None, stop=None, progress=None):
+        """
+        Best action for state.to_move (a SimState), or None if it has no
+        actions. stop (a threading.Event) ends the search early; progress
+        is called with the best action of every finished depth.
+        """
+        self.nodes = 0
+        self.tt_hits = 0
+        start = time.perf_counter()
+        self._deadline = start + self.time_ms / 1000
+        self._stop = stop
+
+        game = sim_game(state)
+        root = snapshot(game)
+        best, reached = None, 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                value, action = self._root(game, depth, seed)
+            except _Timeout:
+                # unwound mid-line: put the scratch game back on the root
+                restore(game, root)
+                break
+            if action is not None:
+                best, reached = action, depth
+                seed = action   # next iteration searches it first
+                if progress is not None:
+                    progress(action)
+
+        if best is None:
+            # not even depth 1 finished in time: fall back to the seed
+            actions = legal_actions(game)
+            best = seed if seed in actions else (actions[0] if actions else None)
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "depth": reached,
+            "nodes": self.nodes,
+            "seconds": elapsed,
+            "nodes_per_sec": self.nodes / elapsed if elapsed else 0.0,
+            "tt_hits": self.tt_hits,
+            "tt_size": len(self.tt),
+        }
+        return best
+
+    def _root(self, game, depth, seed):
+        actions = self._ordered(game, seed, None)
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_action, best_value = None, -WIN_SCORE - 1
+        for action in actions:
+            value = -self._child(game, action, depth - 1, -beta, -alpha)
+            if value > best_value:
+                best_value, best_action = value, action
+            alpha = max(alpha, value)
+        return best_value, best_action
+
+    def _child(self, game, action, depth, alpha, beta):
+        """Negamax value of `game` after `action`; the game is left as it was."""
+        undo = snapshot(game)
+        apply(game, action, TICKS_PER_TURN)
+        value = self._negamax(game, depth, alpha, beta)
+        restore(game, undo)
+        return value
+
+    def _negamax(self, game, depth, alpha, beta):
+        self.nodes += 1
+        if not self.nodes & 255 and (
+                time.perf_counter() > self._deadline
+                or self._stop is not None and self._stop.is_set()):
+            raise _Timeout
+
+        if depth == 0 or game.winner() is not None:
+            return evaluate(game)
+
+        h = self.zobrist.hash(game)
+        entry = self.tt.get(h)
+        tt_move = None
+        if entry is not None:
+            e_depth, e_value, e_flag, tt_move = entry
+            if e_depth >= depth:
+                self.tt_hits += 1
+                if e_flag == EXACT:
+                    return e_value
+                if e_flag == LOWER:
+                    alpha = max(alpha, e_value)
+                elif e_flag == UPPER:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value
+
+        actions = self._ordered(game, None, tt_move)
+        if not actions:
+            return evaluate(game)
+
+        alpha0 = alpha
+        best_value, best_action = -WIN_SCORE - 1, None
+        for action in actions:
+            value = -self._child(game, action, depth - 1, -beta, -alpha)
+            if value > best_value:
+                best_value, best_action = value, action
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        flag = EXACT
+        if best_value <= alpha0:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        self._store(h, (depth, best_value, flag, best_action))
+        return best_value
+
+    def _ordered(self, game, seed, tt_move):
+        actions = legal_actions(game)
+        first = tt_move if tt_move is not None else seed
+        opp = game.grid.units(other_side(game.to_move))
+        actions.sort(key=lambda a: _order_score(game, a, first, opp), reverse=True)
+        return actions
+
+    def _store(self, h, entry):
+        if h not in self.tt and len(self.tt) >= TT_MAX_ENTRIES:
+            # bounded: drop the oldest entry
+            del self.tt[next(iter(self.tt))]
+        self.tt[h] = entry
+
+
+# --------------------------------------------------
+# GREEDY SEED
+# --------------------------------------------------
+def greedy_seed(grid):
+    """The action the greedy heuristics would pick, to search first."""
+    return greedy_action(grid, ENEMY)
+
+
+def alphabeta_cpu_turn(grid, memory=None):
+    """Search the enemy's best action and play it on the live grid."""
+    search_cpu_turn(grid, memory, "alphabeta",
+                    lambda seed: AlphaBetaCPU(),
+                    lambda cpu, state: cpu.choose(state, greedy_seed(grid)))
+
+
+def last_search_stats(grid):
+    """depth / nodes / seconds / nodes_per_sec / tt stats of the game's last search."""
+    return searcher_stats(grid, "alphabeta")
@@ -0,0 +1,234 @@
+"""
+background.py
+-------------
+Runs a search CPU (alphabeta / mcts) on a background thread so the
+60 FPS loop keeps drawing and ticking animations while it thinks.
+
+- start(state) hands the immutable SimState of the board (read by
+  search_turn.live_sim_state) to one persistent daemon worker thread
+- the worker posts (job, "best", action) to a queue.Queue whenever the
+  search has a new best action and (job, "done", action) at the end
+- poll(grid), called once per frame on the main thread, drains the
+  queue and plays the final action with execute_action. Past
+  CPU_DEADLINE_MS it stops the search and plays the best action found
+  so far (or the greedy one if there is none yet)
+- cancel() stops the running search and discards its results; call it
+  on reset
+- close() cancels and ends the worker thread with a shutdown message on
+  its queue. The thread holds no reference to its BackgroundCPU, so a
+  game that is simply dropped (its grid, and with it its CPUMemory, is
+  garbage collected) closes its worker the same way
+
+Only the worker touches the searcher, only the main thread touches the
+grid and anim_mgr.
+"""
+
+import queue
+import threading
+import time
+import weakref
+
+from config import BACKGROUND_CPU_MODE, CPU_DEADLINE_MS
+from logic_cpu.search_turn import search_cpu_turn
+from logic_cpu.simulation import ENEMY, sim_board, greedy_action
+
+
+_CLOSE = ("close", None, None)  # job that ends the worker thread
+
+
+def _make_searcher(mode, seed=None):
+    if mode == "alphabeta":
+        from logic_cpu.alphabeta import AlphaBetaCPU
+        return AlphaBetaCPU()
+    if mode == "mcts":
+        from logic_cpu.mcts import MCTSCPU
+        return MCTSCPU(seed=seed)
+    raise ValueError(f"background CPU mode must be 'alphabeta' or 'mcts', not {mode!r}")
+
+
+class BackgroundCPU:
+    def __init__(self, mode=BACKGROUND_CPU_MODE, deadline_ms=CPU_DEADLINE_MS, seed=None):
+        self.mode = mode
+        self.deadline_ms = deadline_ms
+        self.searcher = _make_searcher(mode, seed)
+        self.last_stats = {}
+
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = None
+        self._closer = None     # weakref.finalize that sends _CLOSE
+
+        self._serial = 0        # job ids keep counting up, so a cancelled
+        self._job = 0           # search's late results are never mistaken
+                                # for the current one's; 0 = idle
+        self._stop = None
+        self._state = None
+        self._best = None
+        self._started = 0.0
+        self._deadline = 0.0
+
+    @property
+    def busy(self):
+        return self._job != 0
+
+    # ------------------------------
+    # MAIN THREAD
+    # ------------------------------
+    def start(self, state):
+        """Start deciding the enemy's action on `state` (a SimState)."""
+        if self.busy or state.winner() is not None:
+            return
+
+        if self._closer is None or not self._closer.alive:
+            self._worker = threading.Thread(
+                target=_run, args=(self._jobs, self._results, self.searcher, self.mode),
+                name="cpu-search", daemon=True,
+            )
+            self._worker.start()
+            self._closer = weakref.finalize(self, self._jobs.put, _CLOSE)
+
+        self._serial += 1
+        self._job = self._serial
+        self._stop = threading.Event()
+        self._state = state
+        self._best = None
+        self._started = time.perf_counter()
+        self._deadline = self._started + self.deadline_ms / 1000
+        self._jobs.put((self._job, state, self._stop))
+
+    def poll(self, grid):
+        """Play the decision if it is ready (or overdue). True if played."""
+        if not self.busy:
+            return False
+
+        done = False
+        while True:
+            try:
+                job, kind, action = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if job != self._job:
+                continue    # a cancelled search finishing late
+            if action is not None:
+                self._best = action
+            if kind == "done":
+                done = True
+
+        overdue = not done and time.perf_counter() >= self._deadline
+        if not done and not overdue:
+            return False
+
+        if overdue:
+            self._stop.set()
+            self._reset_searcher()  # its tree may not match what gets played
+        action = self._best
+        if action is None:
+            action = greedy_action(sim_board(self._state), ENEMY)
+
+        self.last_stats = {
+            "seconds": time.perf_counter() - self._started,
+            "deadline_hit": overdue,
+            "search": dict(getattr(self.searcher, "last_stats", {})) if done else {},
+        }
+        self._finish()
+
+        if action is not None:
+            from logic_cpu.cpu_controller import execute_action
+            execute_action(grid, action)
+        return True
+
+    def cancel(self):
+        """Abandon the running decision (game reset)."""
+        if self._stop is not None:
+            self._stop.set()
+        self._finish()
+        self._reset_searcher()
+
+    def close(self):
+        """Abandon the running decision and end the worker thread (quit)."""
+        if self._stop is not None:
+            self._stop.set()
+        self._finish()
+        if self._closer is not None and self._closer.alive:
+            self._closer()
+            # the old worker drains its own queue; a later start() gets
+            # a new worker with fresh queues
+            self._jobs = queue.Queue()
+            self._results = queue.Queue()
+
+    def observe(self, action):
+        """Forward the player's action to a tree-reusing searcher."""
+        if not self.busy and hasattr(self.searcher, "observe"):
+            self._jobs.put(("observe", action, None))
+
+    def _reset_searcher(self):
+        if hasattr(self.searcher, "reset"):
+            self._jobs.put(("reset", None, None))
+
+    def _finish(self):
+        self._job = 0
+        self._stop = None
+        self._state = None
+
+
+# --------------------------------------------------
+# WORKER THREAD
+# --------------------------------------------------
+def _run(jobs, results, searcher, mode):
+    # only the queues and the searcher: holding the BackgroundCPU would
+    # keep it alive, and with it this thread
+    while True:
+        job, state, stop = jobs.get()
+        if job == "close":
+            return
+        if job == "reset":
+            searcher.reset()
+            continue
+        if job == "observe":
+            searcher.observe(state)
+            continue
+
+        def progress(action, job=job):
+            results.put((job, "best", action))
+
+        if mode == "alphabeta":
+            seed = greedy_action(sim_board(state), ENEMY)
+            action = searcher.choose(state, seed, stop, progress)
+        else:
+            action = searcher.choose(state, stop, progress)
+        results.put((job, "done", action))
+
+
+def background_cpu_turn(grid, memory=None):
+    """Start the enemy's decision; poll_background_cpu plays it later."""
+    search_cpu_turn(grid, memory, "background",
+                    lambda seed: BackgroundCPU(seed=seed),
+                    lambda cpu, state: cpu.start(state))
+
+
+def poll_background_cpu(grid, memory):
+    cpu = memory.existing("background")
+    return cpu is not None and cpu.poll(grid)
+
+
+def background_busy(memory):
+    cpu = memory.existing("background")
+    return cpu is not None and cpu.busy
+
+
+def cancel_background_cpu(memory):
+    cpu = memory.existing("background")
+    if cpu is not None:
+        cpu.cancel()
+
+
+def close_background_cpu(memory):
+    cpu = memory.existing("background")
+    if cpu is not None:
+        cpu.close()
+
+
+def observe_background(memory, action):
+    cpu = memory.existing("background")
+    if cpu is not None:
+        cpu.observe(action)
@@ -0,0 +1,132 @@
+"""
+cooperative.py
+--------------
+Frame-budgeted CPU without threads: the MCTS decision runs as a
+generator (MCTSCPU.steps) and the main loop advances it a slice at a
+time, using whatever is left of the current frame.
+
+- start(state) creates the generator for the SimState of the board
+- step(grid, frame_start), called once per frame after drawing, runs
+  search iterations until FRAME_MS - CPU_FRAME_RESERVE_MS have passed
+  since frame_start (always at least one, so the search can't starve)
+  and plays the action with execute_action once the generator returns
+- every slice's length is recorded; slice_stats() reports the last,
+  mean and worst slice in ms plus how many frames the decision took
+"""
+
+import time
+from collections import deque
+
+from config import FPS, CPU_FRAME_RESERVE_MS
+from logic_cpu.memory import CPUMemory
+from logic_cpu.search_turn import search_cpu_turn
+
+FRAME_MS = 1000 / FPS
+SLICE_HISTORY = 120  # slices kept for slice_stats, ~2 s of frames
+
+
+class CooperativeCPU:
+    def __init__(self, reserve_ms=CPU_FRAME_RESERVE_MS, seed=None):
+        from logic_cpu.mcts import MCTSCPU
+
+        self.reserve_ms = reserve_ms
+        self.searcher = MCTSCPU(seed=seed)
+        self.slices = deque(maxlen=SLICE_HISTORY)  # ms per frame
+        self.frames = 0     # frames the current / last decision took
+        self._steps = None
+
+    @property
+    def busy(self):
+        return self._steps is not None
+
+    def start(self, state):
+        if self.busy or state.winner() is not None:
+            return
+        self._steps = self.searcher.steps(state)
+        self.frames = 0
+
+    def step(self, grid, frame_start=None):
+        """Think for the rest of this frame. True once the action was played."""
+        if not self.busy:
+            return False
+
+        now = time.perf_counter()
+        if frame_start is None:
+            frame_start = now
+        end = frame_start + (FRAME_MS - self.reserve_ms) / 1000
+
+        action, done = None, False
+        while True:
+            try:
+                next(self._steps)
+            except StopIteration as stop:
+                action, done = stop.value, True
+                break
+            if time.perf_counter() >= end:
+                break
+
+        self.slices.append((time.perf_counter() - now) * 1000)
+        self.frames += 1
+        if not done:
+            return False
+
+        self._steps = None
+        if action is not None:
+            from logic_cpu.cpu_controller import execute_action
+            execute_action(grid, action)
+        return True
+
+    def cancel(self):
+        if self._steps is not None:
+            self._steps.close()
+        self._steps = None
+        self.searcher.reset()
+
+    def observe(self, action):
+        if not self.busy:
+            self.searcher.observe(action)
+
+    def slice_stats(self):
+        if not self.slices:
+            return {}
+        return {
+            "last_ms": self.slices[-1],
+            "mean_ms": sum(self.slices) / len(self.slices),
+            "max_ms": max(self.slices),
+            "frames": self.frames,
+        }
+
+
+def cooperative_cpu_turn(grid, memory=None):
+    """Start the enemy's decision; step_cooperative_cpu spreads it over frames."""
+    search_cpu_turn(grid, memory, "cooperative",
+                    lambda seed: CooperativeCPU(seed=seed),
+                    lambda cpu, state: cpu.start(state))
+
+
+def step_cooperative_cpu(grid, memory, frame_start=None):
+    cpu = memory.existing("cooperative")
+    return cpu is not None and cpu.step(grid, frame_start)
+
+
+def cooperative_busy(memory):
+    cpu = memory.existing("cooperative")
+    return cpu is not None and cpu.busy
+
+
+def cancel_cooperative_cpu(memory):
+    cpu = memory.existing("cooperative")
+    if cpu is not None:
+        cpu.cancel()
+
+
+def observe_cooperative(memory, action):
+    cpu = memory.existing("cooperative")
+    if cpu is not None:
+        cpu.observe(action)
+
+
+def last_slice_stats(grid):
+    """last / mean / max ms of the game's per-frame thinking slices."""
+    cpu = CPUMemory.for_grid(grid).existing("cooperative")
+    return cpu.slice_stats() if cpu else {}
@@ -2,22 +2,19 @@ import random
 from grid import cell_center
 from animations import anim_mgr
 from logic_attack import perform_attack_logic
+from actions import Move, Attack
+from effects import live_state
+import engine
+import influence
 
-from logic_cpu.greedy_move import greedy_nearest_move
-from logic_cpu.greedy_escape import greedy_escape_move
-from logic_cpu.greedy_target_weakest import greedy_best_target
-from logic_cpu.greedy_element import greedy_element_attack
+from logic_cpu.flow_field import DistanceField
+from logic_cpu.threat_map import ThreatMap
+from logic_cpu.turn_cache import TurnCache
+from logic_cpu.memory import CPUMemory  # per-game "human-like" memory
 
 
-# ------------------------------
-# CPU MEMORY (Human-like state)
-# ------------------------------
-last_attacked_enemy = None
-last_attacked_turn = -1
-current_turn = 0
-
-threatened_ally = None
-threatened_turn = -1
+# per point of extra incoming damage on the destination tile
+MOVE_THREAT_WEIGHT = 0.05
 
 
 # --------------------------------------------------
@@ -28,22 +25,57 @@ def is_heal_attack(atk):
 
 
 def move_callback(grid, e_pos, new_pos, e_card):
-    grid.tiles[new_pos[0]][new_pos[1]].card = e_card
-    grid.tiles[e_pos[0]][e_pos[1]].card = None
+    # the card may have died (burn / flame tick) or the tile may have
+    # been taken while the move animation was playing
+    if grid.card_at(*e_pos) is e_card and grid.card_at(*new_pos) is None:
+        engine.play(live_state(grid), Move(e_pos, new_pos))
+
+
+def execute_action(grid, action):
+    """Play a Move / Attack on the live grid, animated: attacks fly a
+    projectile, moves walk their PathFinder route. Used for CPU actions
+    and the player's moves."""
+    src, dst = action.src, action.dst
+    card = grid.card_at(*src)
+    if card is None:
+        return
+
+    if isinstance(action, Attack):
+        atk = card.attacks[action.attack_idx]
+        dist = abs(src[0] - dst[0]) + abs(src[1] - dst[1])
+        anim_mgr.trigger_attack_anim(
+            cell_center(*src),
+            cell_center(*dst),
+            atk.element,
+            lambda: perform_attack_logic(
+                src[0], src[1],
+                dst[0], dst[1],
+                atk, grid, dist
+            )
+        )
+        return
+
+    path = grid.paths.find(src, dst, card.move_range)
+    if path is None:
+        return
+    anim_mgr.trigger_move_anim(
+        cell_center(*src),
+        cell_center(*dst),
+        lambda: move_callback(grid, src, dst, card),
+        [cell_center(*p) for p in path]
+    )
 
 
 def find_ally_to_heal(grid):
     weakest = None
     lowest_ratio = 1.0
 
-    for c in range(grid.cols):
-        for r in range(grid.rows):
-            card = grid.tiles[c][r].card
-            if card and card.owner == "enemy":
-                ratio = card.hp / card.max_hp
-                if ratio < 0.5 and ratio < lowest_ratio:
-                    lowest_ratio = ratio
-                    weakest = (c, r)
+    for (c, r) in grid.units("enemy"):
+        card = grid.card_at(c, r)
+        ratio = card.hp / card.max_hp
+        if ratio < 0.5 and ratio < lowest_ratio:
+            lowest_ratio = ratio
+            weakest = (c, r)
 
     return weakest
 
@@ -51,29 +83,34 @@ def find_ally_to_heal(grid):
 # --------------------------------------------------
 # ENEMY PRIORITY
 # --------------------------------------------------
-def enemy_priority(e_pos, e_card, players, grid):
-    global threatened_ally, threatened_turn
+def enemy_priority(e_pos, e_card, players, grid, field=None, threat=None, cache=None,
+                   memory=None):
+    if memory is None:
+        memory = CPUMemory.for_grid(grid)
+    turn = memory.current_turn
 
-    from logic_cpu.cpu_controller import (
-        last_attacked_enemy, last_attacked_turn, current_turn
-    )
-
-    if last_attacked_enemy == e_pos and current_turn - last_attacked_turn <= 1:
+    if memory.last_attacked_enemy == e_pos and turn - memory.last_attacked_turn <= 1:
         return 1500
 
-    if threatened_ally and current_turn - threatened_turn <= 1 and e_pos != threatened_ally:
-        dist = abs(e_pos[0] - threatened_ally[0]) + abs(e_pos[1] - threatened_ally[1])
+    ally = memory.threatened_ally
+    if ally and turn - memory.threatened_turn <= 1 and e_pos != ally:
+        dist = abs(e_pos[0] - ally[0]) + abs(e_pos[1] - ally[1])
         return 1200 - dist * 10
 
-    target = greedy_best_target(e_pos, players, grid)
+    if field is None:
+        field = DistanceField(grid, players)
+    if cache is None:
+        cache = TurnCache(grid, field, threat)
+
+    target = cache.best_target(e_pos, players)
     if target:
-        atk = greedy_element_attack(e_card, target, grid)
+        atk = cache.element_attack(e_card, target)
         dist = abs(e_pos[0] - target[0]) + abs(e_pos[1] - target[1])
         if dist <= atk.attack_range:
             return 1000
 
     hp_factor = 1 - (e_card.hp / e_card.max_hp)
-    min_dist = min(abs(e_pos[0] - p[0]) + abs(e_pos[1] - p[1]) for p in players)
+    min_dist = field.nearest(e_pos)
 
     return hp_factor * 100 + (10 / max(min_dist, 1))
 
@@ -81,34 +118,48 @@ def enemy_priority(e_pos, e_card, players, grid):
 # --------------------------------------------------
 # MOVE SCORE
 # --------------------------------------------------
-def calculate_move_score(e_pos, players, grid, e_card):
-    def dist(a, b):
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+def calculate_move_score(e_pos, players, grid, e_card, field=None, threat=None, maps=None,
+                         cache=None):
+    if field is None:
+        field = DistanceField(grid, players)
+    if cache is None:
+        cache = TurnCache(grid, field, threat, maps)
 
-    current_dist = min(dist(e_pos, p) for p in players)
+    current_dist = field.nearest(e_pos)
 
     if e_card.element in ["water", "leaf"] and e_card.hp < e_card.max_hp * 0.5:
-        new_pos = greedy_escape_move(e_pos, players, grid, e_card.move_range)
+        new_pos = cache.escape_move(e_pos, players, e_card.move_range)
     else:
-        new_pos = greedy_nearest_move(e_pos, players, grid, e_card.move_range)
+        new_pos = cache.nearest_move(e_pos, players, e_card.move_range)
 
     if new_pos == e_pos:
         return -5
 
-    new_dist = min(dist(new_pos, p) for p in players)
-    return current_dist - new_dist
+    # the move branch asks for the same path, so this warms the cache
+    if grid.paths.find(e_pos, new_pos, e_card.move_range) is None:
+        return -5
+
+    new_dist = field.nearest(new_pos)
+    score = current_dist - new_dist
+    if threat is not None:
+        # stepping into more incoming damage makes moving less attractive
+        score -= (threat.at(new_pos) - threat.at(e_pos)) * MOVE_THREAT_WEIGHT
+    return score
 
 
 # --------------------------------------------------
 # ATTACK SCORE
 # --------------------------------------------------
-def calculate_attack_score(e_card, players, grid, e_pos):
-    target_pos = greedy_best_target(e_pos, players, grid)
+def calculate_attack_score(e_card, players, grid, e_pos, threat=None, cache=None):
+    if cache is None:
+        cache = TurnCache(grid, threat=threat)
+
+    target_pos = cache.best_target(e_pos, players)
     if not target_pos:
         return -10
 
-    target_card = grid.tiles[target_pos[0]][target_pos[1]].card
-    atk = greedy_element_attack(e_card, target_pos, grid)
+    target_card = grid.card_at(*target_pos)
+    atk = cache.element_attack(e_card, target_pos)
 
     dist = abs(e_pos[0] - target_pos[0]) + abs(e_pos[1] - target_pos[1])
     if dist > atk.attack_range:
@@ -121,35 +172,40 @@ def calculate_attack_score(e_card, players, grid, e_pos):
 # --------------------------------------------------
 # CPU TURN
 # --------------------------------------------------
-def cpu_turn(grid):
-    global current_turn, threatened_ally, threatened_turn
-    current_turn += 1
+def cpu_turn(grid, memory=None):
+    if memory is None:
+        memory = CPUMemory.for_grid(grid)
+    memory.current_turn += 1
 
     if anim_mgr.blocking:
         return
 
-    enemies, players = [], []
-
-    for c in range(grid.cols):
-        for r in range(grid.rows):
-            card = grid.tiles[c][r].card
-            if card:
-                if card.owner == "enemy":
-                    enemies.append((c, r))
-                else:
-                    players.append((c, r))
+    enemies = grid.units("enemy")
+    players = grid.units("player")
 
     if not enemies or not players:
         return
 
+    # distances to / threat from the player units, shared by every
+    # heuristic this turn
+    field = DistanceField(grid, players)
+    threat = ThreatMap(grid, players)
+
+    # control / danger per tile, maintained incrementally by the rules
+    maps = influence.InfluenceMaps.for_state(live_state(grid))
+
+    # every heuristic answer of this turn, computed once
+    cache = memory.last_turn_cache = TurnCache(grid, field, threat, maps)
+
     # Select best enemy
     best_enemy = max(
         enemies,
-        key=lambda pos: enemy_priority(pos, grid.tiles[pos[0]][pos[1]].card, players, grid)
+        key=lambda pos: enemy_priority(pos, grid.card_at(*pos), players, grid,
+                                       field, threat, cache, memory)
     )
 
     e_pos = best_enemy
-    e_card = grid.tiles[e_pos[0]][e_pos[1]].card
+    e_card = grid.card_at(*e_pos)
 
     panic = e_card.hp < e_card.max_hp * 0.35
 
@@ -162,8 +218,8 @@ def cpu_turn(grid):
     if ally_to_heal == e_pos:
         ally_to_heal = None
 
-    move_score = calculate_move_score(e_pos, players, grid, e_card)
-    attack_score = calculate_attack_score(e_card, players, grid, e_pos)
+    move_score = calculate_move_score(e_pos, players, grid, e_card, field, threat, maps, cache)
+    attack_score = calculate_attack_score(e_card, players, grid, e_pos, threat, cache)
 
     # --------------------------------------------------
     # HEALING (SELF / ALLY)
@@ -207,12 +263,12 @@ def cpu_turn(grid):
     # PANIC ATTACK (ALL ENEMIES)
     # --------------------------------------------------
     if panic:
-        threatened_ally = e_pos
-        threatened_turn = current_turn
+        memory.threatened_ally = e_pos
+        memory.threatened_turn = memory.current_turn
 
-        target_pos = greedy_best_target(e_pos, players, grid)
+        target_pos = cache.best_target(e_pos, players)
         if target_pos:
-            atk = greedy_element_attack(e_card, target_pos, grid)
+            atk = cache.element_attack(e_card, target_pos)
             dist = abs(e_pos[0] - target_pos[0]) + abs(e_pos[1] - target_pos[1])
 
             if dist <= atk.attack_range:
@@ -232,9 +288,9 @@ def cpu_turn(grid):
     # NORMAL ATTACK
     # --------------------------------------------------
     if attack_score >= move_score:
-        target_pos = greedy_best_target(e_pos, players, grid)
+        target_pos = cache.best_target(e_pos, players)
         if target_pos:
-            atk = greedy_element_attack(e_card, target_pos, grid)
+            atk = cache.element_attack(e_card, target_pos)
             dist = abs(e_pos[0] - target_pos[0]) + abs(e_pos[1] - target_pos[1])
 
             if dist <= atk.attack_range:
@@ -253,17 +309,29 @@ def cpu_turn(grid):
     # --------------------------------------------------
     # MOVE
     # --------------------------------------------------
-    if threatened_ally and current_turn - threatened_turn <= 1 and e_pos != threatened_ally:
-        new_pos = greedy_nearest_move(e_pos, [threatened_ally], grid, e_card.move_range)
+    ally = memory.threatened_ally
+    if ally and memory.current_turn - memory.threatened_turn <= 1 and e_pos != ally:
+        new_pos = cache.nearest_move(e_pos, [ally], e_card.move_range)
     else:
         if e_card.element in ["water", "leaf"]:
-            new_pos = greedy_escape_move(e_pos, players, grid, e_card.move_range)
+            new_pos = cache.escape_move(e_pos, players, e_card.move_range)
         else:
-            new_pos = greedy_nearest_move(e_pos, players, grid, e_card.move_range)
+            new_pos = cache.nearest_move(e_pos, players, e_card.move_range)
 
     if new_pos != e_pos:
+        path = grid.paths.find(e_pos, new_pos, e_card.move_range)
+        if path is None:
+            return
+
         anim_mgr.trigger_move_anim(
             cell_center(*e_pos),
             cell_center(*new_pos),
-            lambda: move_callback(grid, e_pos, new_pos, e_card)
+            lambda: move_callback(grid, e_pos, new_pos, e_card),
+            [cell_center(*p) for p in path]
         )
+
+
+def last_cache_stats(grid):
+    """hits / misses / hit_rate / entries of the game's last TurnCache."""
+    cache = CPUMemory.for_grid(grid).last_turn_cache
+    return cache.stats() if cache else {}
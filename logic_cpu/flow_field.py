@@ -0,0 +1,134 @@
+# flow_field.py
+"""
+Distance field from a set of source tiles (normally every player unit),
+built once at the start of a CPU turn so the heuristics can read
+distances per tile in O(1) instead of looping over every player.
+
+Distances are unobstructed grid steps, i.e. the same Manhattan metric
+the greedy heuristics have always used:
+
+- nearest:  multi-source BFS, distance to the closest source
+- distance: per-source layer; without obstacles a single-source BFS is
+            exactly the Manhattan distance, so layers are read in closed
+            form instead of being stored
+- spread:   sum over sources of |d - ideal| (greedy_nearest_move's score),
+            built for the whole board from per-axis prefix sums plus a
+            small stamp around each source
+
+Everything is computed lazily on first read. On a SparseGrid no
+board-sized array is ever allocated: nearest falls back to a min over
+the sources and the spread weights are kept in a dict.
+"""
+
+from array import array
+
+from grid import ball_offsets
+
+
+def _axis_sums(coords, size):
+    """out[x] = sum(|x - v| for v in coords), for every x in range(size)."""
+    counts = [0] * size
+    for v in coords:
+        counts[v] += 1
+
+    total, total_s = len(coords), sum(coords)
+    left_n = left_s = 0
+    out = []
+    for x in range(size):
+        left_n += counts[x]
+        left_s += counts[x] * x
+        out.append(
+            x * left_n - left_s +
+            (total_s - left_s) - x * (total - left_n)
+        )
+    return out
+
+
+class DistanceField:
+    def __init__(self, grid, sources):
+        self.grid = grid
+        self.sources = list(sources)
+        self._nearest = None
+        self._col_sums = None
+        self._row_sums = None
+        self._near_weight = {}  # ideal -> {flat index: sum(max(0, ideal - d))}
+
+    # ------------------------------
+    # NEAREST SOURCE (multi-source BFS)
+    # ------------------------------
+    def nearest(self, pos):
+        if self.grid.sparse:
+            return min(abs(c - pos[0]) + abs(r - pos[1]) for c, r in self.sources)
+        if self._nearest is None:
+            self._nearest = self._build_nearest()
+        return self._nearest[pos[0] * self.grid.rows + pos[1]]
+
+    def _build_nearest(self):
+        rows = self.grid.rows
+        neighbors = self.grid.neighbors
+        dist = array("i", [-1]) * (self.grid.cols * rows)
+
+        frontier = []
+        for c, r in self.sources:
+            i = c * rows + r
+            if dist[i] < 0:
+                dist[i] = 0
+                frontier.append(i)
+
+        d = 0
+        while frontier:
+            d += 1
+            nxt = []
+            for i in frontier:
+                for n in neighbors[i]:
+                    if dist[n] < 0:
+                        dist[n] = d
+                        nxt.append(n)
+            frontier = nxt
+
+        return dist
+
+    # ------------------------------
+    # PER-SOURCE LAYER
+    # ------------------------------
+    def distance(self, source, pos):
+        return abs(source[0] - pos[0]) + abs(source[1] - pos[1])
+
+    # ------------------------------
+    # SPREAD: sum(|d - ideal|) over all sources
+    # ------------------------------
+    def spread(self, pos, ideal):
+        """
+        |d - k| == (d - k) + 2 * max(0, k - d), so the sum splits into
+        the plain distance sum (separable per axis) and a weight that only
+        tiles within k - 1 steps of a source receive.
+        """
+        if self._col_sums is None:
+            self._col_sums = _axis_sums([c for c, _ in self.sources], self.grid.cols)
+            self._row_sums = _axis_sums([r for _, r in self.sources], self.grid.rows)
+
+        weight = self._near_weight.get(ideal)
+        if weight is None:
+            weight = self._near_weight[ideal] = self._build_near_weight(ideal)
+
+        c, r = pos
+        return (
+            self._col_sums[c] + self._row_sums[r]
+            - len(self.sources) * ideal
+            + 2 * weight.get(c * self.grid.rows + r, 0)
+        )
+
+    def _build_near_weight(self, ideal):
+        cols, rows = self.grid.cols, self.grid.rows
+        weight = {}
+        if ideal <= 0:
+            return weight
+
+        stamp = [(dc, dr, ideal - abs(dc) - abs(dr)) for dc, dr in ball_offsets(ideal - 1)]
+        for sc, sr in self.sources:
+            for dc, dr, w in stamp:
+                c, r = sc + dc, sr + dr
+                if 0 <= c < cols and 0 <= r < rows:
+                    i = c * rows + r
+                    weight[i] = weight.get(i, 0) + w
+        return weight
@@ -7,7 +7,7 @@ def element_score(atk_el, target_el):
     return 1
 
 def greedy_element_attack(e_card, target_pos, grid):
-    target_card = grid.tiles[target_pos[0]][target_pos[1]].card
+    target_card = grid.card_at(*target_pos)
     best_score = -1
     best_attack = None
     for atk in e_card.attacks:
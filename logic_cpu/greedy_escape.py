@@ -1,38 +1,34 @@
-def greedy_escape_move(e_pos, players, grid, move_range):
-    possible_moves = []
-
-    for c in range(
-        max(0, e_pos[0] - move_range),
-        min(grid.cols, e_pos[0] + move_range + 1)
-    ):
-        for r in range(
-            max(0, e_pos[1] - move_range),
-            min(grid.rows, e_pos[1] + move_range + 1)
-        ):
-            if abs(c - e_pos[0]) + abs(r - e_pos[1]) <= move_range:
-                if grid.tiles[c][r].card is None:
-                    possible_moves.append((c, r))
+from logic_cpu.threat_map import ThreatMap
+
+
+def greedy_escape_move(e_pos, players, grid, move_range, threat=None, influence=None,
+                       exclude=()):
+    # sorted keeps the old column-major scan order for tie-breaking;
+    # `exclude` holds tiles already claimed by other planned moves
+    possible_moves = [
+        (c, r) for (c, r) in sorted(grid.reach.moves(e_pos, move_range))
+        if grid.card_at(c, r) is None and (c, r) not in exclude
+    ]
 
     if not possible_moves:
         return e_pos
 
+    # expected incoming damage per tile, from all attacks of all players
+    if threat is None:
+        threat = ThreatMap(grid, players)
+
+    owner = grid.card_at(*e_pos).owner
+
     best_tile = e_pos
     best_threat = float("inf")
 
     for (c, r) in possible_moves:
-        threat = 0
-        for (px, py) in players:
-            attacker = grid.tiles[px][py].card
-            if not attacker:
-                continue
-            dist = abs(px - c) + abs(py - r)
-            if dist <= attacker.attacks[0].attack_range:
-                threat += attacker.attacks[0].dmg * 2
-            else:
-                threat += attacker.attacks[0].dmg / max(dist, 1)
-
-        if threat < best_threat:
-            best_threat = threat
+        t = threat.at((c, r))
+        if influence is not None:
+            # don't run into opposing fire
+            t += influence.flame_danger(owner, (c, r))
+        if t < best_threat:
+            best_threat = t
             best_tile = (c, r)
 
     return best_tile
@@ -1,5 +1,5 @@
 # greedy_fire.py
-import random
+from game_rng import GameRNG
 
 def greedy_fire_spread(e_pos, players, grid,rng):
     directions = [(1, 0), (-1, 0)]
@@ -11,7 +11,7 @@ def greedy_fire_spread(e_pos, players, grid,rng):
         for i in range(1, rng+1):
             nc = e_pos[0] + dx * i
             nr = e_pos[1] + dy * i
-            if grid.in_bounds(nc, nr) and grid.tiles[nc][nr].card and grid.tiles[nc][nr].card.owner == "player":
+            if grid.in_bounds(nc, nr) and grid.card_at(nc, nr) and grid.card_at(nc, nr).owner == "player":
                 hits += 1
         if hits > max_hits:
             max_hits = hits
@@ -21,8 +21,9 @@ def greedy_fire_spread(e_pos, players, grid,rng):
     for i in range(1, 6):
         nc = e_pos[0] + best_dir[0] * i
         nr = e_pos[1] + best_dir[1] * i
-        if grid.in_bounds(nc, nr) and grid.tiles[nc][nr].card and grid.tiles[nc][nr].card.owner == "player":
+        if grid.in_bounds(nc, nr) and grid.card_at(nc, nr) and grid.card_at(nc, nr).owner == "player":
             return (nc, nr)
 
-    return random.choice(players) if players else None
+    # the game's ai stream, so a seeded game replays the same choice
+    return GameRNG.for_grid(grid).ai.choice(players) if players else None
 
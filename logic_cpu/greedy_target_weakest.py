@@ -1,4 +1,4 @@
-def greedy_best_target(e_pos, players, grid):
+def greedy_best_target(e_pos, players, grid, threat=None):
     """
     Greedy target selection based on:
     - Low HP (kill potential)
@@ -10,7 +10,7 @@ def greedy_best_target(e_pos, players, grid):
     best_target = None
 
     for (px, py) in players:
-        card = grid.tiles[px][py].card
+        card = grid.card_at(px, py)
         if not card:
             continue
 
@@ -22,12 +22,15 @@ def greedy_best_target(e_pos, players, grid):
         dist_factor = 1 / max(dist, 1)
 
         # 3️⃣ Prefer high-damage threats
-        threat = max(a.dmg for a in card.attacks)
+        if threat is not None:
+            danger = threat.unit_damage((px, py))
+        else:
+            danger = max(a.dmg for a in card.attacks)
 
         score = (
             hp_factor * 10 +
             dist_factor * 5 +
-            threat * 0.3
+            danger * 0.3
         )
 
         if score > best_score:
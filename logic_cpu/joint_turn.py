@@ -0,0 +1,254 @@
+"""
+joint_turn.py
+-------------
+Joint CPU turn: every enemy unit acts, and the decisions are made
+together instead of one best_enemy at a time.
+
+1. self-heal: leaf / water units below 45% hp with a heal attack that
+   would actually heal them (engine.healed_by: the shape covers the
+   caster and it hasn't been healed yet); the rest go on to step 2
+2. attacks: attacker -> target is a maximum-weight assignment over the
+   expected damage (capped at the target's remaining hp) plus the same
+   kill bonus calculate_attack_score uses. It is solved in rounds: after
+   each round the assigned damage is taken off the targets' hp / shield
+   and the attackers still free are matched again, so several units can
+   focus one target without wasting overkill on it
+3. moves: the remaining units, highest enemy_priority first, pick their
+   greedy move while skipping tiles an earlier unit already claimed
+
+Assignment uses scipy's linear_sum_assignment when SciPy is installed,
+otherwise the O(n^2 m) Hungarian algorithm below.
+"""
+
+from actions import Move, Attack
+from animations import anim_mgr
+from aoe import AOE_EFFECTS
+from card import RARITY_MULT
+from config import FPS
+from effects import live_state
+import engine
+import influence
+
+from logic_cpu.cpu_controller import enemy_priority, execute_action, is_heal_attack
+from logic_cpu.flow_field import DistanceField
+from logic_cpu.memory import CPUMemory
+from logic_cpu.greedy_escape import greedy_escape_move
+from logic_cpu.greedy_move import greedy_nearest_move
+from logic_cpu.threat_map import ThreatMap
+from logic_cpu.turn_cache import TurnCache
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+KILL_BONUS = 15  # calculate_attack_score's kill bonus
+
+
+# --------------------------------------------------
+# EXPECTED DAMAGE
+# --------------------------------------------------
+def expected_damage(atk, attacker, target, dist, grid, pos):
+    """
+    (damage, blocked by shields) `target` on `pos` is expected to take
+    when `atk` is aimed at it, mirroring engine.attack. Only normal hits
+    go through the shield first; heal attacks without an AoE (Healing
+    Wave) hit opponents like any other attack.
+    """
+    if dist > atk.attack_range:
+        return 0, False
+
+    if atk.name == "Burning Trail":
+        base = max(1, min(atk.dmg - dist, int(target.max_hp * 0.25)))
+        return max(1, int(base * 0.5)), False
+
+    effect = AOE_EFFECTS.get(atk.name)
+    if effect:
+        # the shape is anchored on the target tile; some (RING8) skip it
+        if pos not in effect.shape.cells(grid, *pos):
+            return 0, False
+        return effect.burn_per_tick * FPS * 2, False
+
+    return int(atk.dmg * RARITY_MULT.get(attacker.rarity, 1.0)), True
+
+
+def attack_value(attacker, target, dist, hp, shield, grid, pos):
+    """(value, attack index, hp lost, shield lost) of `attacker`'s best attack on pos."""
+    best = (0, None, 0, 0)
+    for idx, atk in enumerate(attacker.attacks):
+        dmg, shielded = expected_damage(atk, attacker, target, dist, grid, pos)
+        absorbed = min(shield, dmg) if shielded else 0
+        loss = dmg - absorbed
+        if loss <= 0:
+            continue
+        value = min(loss, hp) + (KILL_BONUS if loss >= hp else 0)
+        if value > best[0]:
+            best = (value, idx, loss, absorbed)
+    return best
+
+
+# --------------------------------------------------
+# ASSIGNMENT
+# --------------------------------------------------
+def hungarian(cost):
+    """
+    Minimum-cost assignment of every row of an n x m matrix (n <= m) to
+    a distinct column. Returns the column of each row.
+    """
+    n, m = len(cost), len(cost[0])
+    INF = float("inf")
+    u, v = [0.0] * (n + 1), [0.0] * (m + 1)
+    match = [0] * (m + 1)   # column -> row (1-based, 0 = free)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        minv = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0, delta, j1 = match[j0], INF, 0
+            row = cost[i0 - 1]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j], way[j] = cur, j0
+                    if minv[j] < delta:
+                        delta, j1 = minv[j], j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    cols = [0] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            cols[match[j] - 1] = j - 1
+    return cols
+
+
+def max_weight_assignment(values):
+    """(row, col) pairs of a maximum-weight matching, positive values only."""
+    if not values or not values[0]:
+        return []
+    n, m = len(values), len(values[0])
+
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(values, maximize=True)
+        pairs = zip(rows.tolist(), cols.tolist())
+    elif n <= m:
+        pairs = enumerate(hungarian([[-x for x in row] for row in values]))
+    else:
+        transposed = [[-values[i][j] for i in range(n)] for j in range(m)]
+        pairs = ((i, j) for j, i in enumerate(hungarian(transposed)))
+
+    return sorted((i, j) for i, j in pairs if values[i][j] > 0)
+
+
+# --------------------------------------------------
+# PLANNING
+# --------------------------------------------------
+def plan_joint_turn(grid, field=None, threat=None, maps=None, memory=None):
+    """One action per enemy unit that has something useful to do."""
+    enemies, players = grid.units("enemy"), grid.units("player")
+    if not enemies or not players:
+        return []
+
+    if field is None:
+        field = DistanceField(grid, players)
+    if threat is None:
+        threat = ThreatMap(grid, players)
+
+    plan = []
+    free = []
+
+    # 1. self-heal
+    for e_pos in enemies:
+        e_card = grid.card_at(*e_pos)
+        heal = None
+        if e_card.element in ("leaf", "water") and e_card.hp < e_card.max_hp * 0.45:
+            heal = next((
+                i for i, a in enumerate(e_card.attacks)
+                if is_heal_attack(a)
+                and any(c is e_card for c in engine.healed_by(grid, *e_pos, *e_pos, a))
+            ), None)
+        if heal is not None:
+            plan.append(Attack(e_pos, heal, e_pos))
+        else:
+            free.append(e_pos)
+
+    # 2. attacks, assigned in rounds
+    hp = {p: grid.card_at(*p).hp for p in players}
+    shield = {p: grid.card_at(*p).shield for p in players}
+    while free and hp:
+        targets = sorted(hp)
+        options = [
+            [attack_value(grid.card_at(*a), grid.card_at(*t),
+                          abs(a[0] - t[0]) + abs(a[1] - t[1]), hp[t], shield[t], grid, t)
+             for t in targets]
+            for a in free
+        ]
+        pairs = max_weight_assignment([[o[0] for o in row] for row in options])
+        if not pairs:
+            break
+
+        assigned = set()
+        for i, j in pairs:
+            a, t = free[i], targets[j]
+            _, idx, loss, absorbed = options[i][j]
+            plan.append(Attack(a, idx, t))
+            assigned.add(a)
+
+            shield[t] -= absorbed
+            hp[t] -= loss
+            if hp[t] <= 0:
+                del hp[t], shield[t]
+        free = [a for a in free if a not in assigned]
+
+    # 3. moves, without two units claiming the same tile
+    # approach whoever is expected to survive the attacks
+    alive = sorted(hp) or players
+    if alive != players:
+        field = DistanceField(grid, alive)
+    cache = TurnCache(grid, field, threat, maps)
+    free.sort(key=lambda pos: -enemy_priority(pos, grid.card_at(*pos), players, grid,
+                                              field, threat, cache, memory))
+    claimed = set()
+    for e_pos in free:
+        e_card = grid.card_at(*e_pos)
+        if e_card.element in ("water", "leaf") and e_card.hp < e_card.max_hp * 0.5:
+            new_pos = greedy_escape_move(e_pos, alive, grid, e_card.move_range,
+                                         threat, maps, exclude=claimed)
+        else:
+            new_pos = greedy_nearest_move(e_pos, alive, grid, e_card.move_range,
+                                          field, exclude=claimed)
+        if new_pos != e_pos:
+            claimed.add(new_pos)
+            plan.append(Move(e_pos, new_pos))
+
+    return plan
+
+
+def joint_cpu_turn(grid, memory=None):
+    """Every enemy acts; the animations play together."""
+    if anim_mgr.blocking:
+        return
+
+    if memory is None:
+        memory = CPUMemory.for_grid(grid)
+    memory.current_turn += 1
+
+    maps = influence.InfluenceMaps.for_state(live_state(grid))
+    for action in plan_joint_turn(grid, maps=maps, memory=memory):
+        execute_action(grid, action)
@@ -8,8 +8,100 @@ a clean import surface for the CPU AI.
 
 Actual greedy logic lives in:
 logic_cpu/cpu_controller.py
+
+Every enemy acting in one turn:
+logic_cpu/joint_turn.py
+
+Search-based controllers:
+logic_cpu/alphabeta.py   (select with config.CPU_MODE or get_cpu_turn)
+logic_cpu/mcts.py
+logic_cpu/parallel.py    (MCTS over a process pool)
+logic_cpu/background.py  (either search on a worker thread; main.py
+                          calls cpu_update every frame to collect it)
+logic_cpu/cooperative.py (MCTS as a generator, advanced by cpu_update
+                          in slices that fit the rest of each frame)
+logic_cpu/search_turn.py (the board -> search -> play glue they share)
 """
 
-from logic_cpu.cpu_controller import cpu_turn
+from logic_cpu.memory import CPUMemory
+from logic_cpu.cpu_controller import cpu_turn, last_cache_stats
+from logic_cpu.joint_turn import joint_cpu_turn
+from logic_cpu.alphabeta import alphabeta_cpu_turn, last_search_stats
+from logic_cpu.mcts import mcts_cpu_turn, observe_player_action, last_mcts_stats
+from logic_cpu.parallel import parallel_cpu_turn, last_parallel_stats
+from logic_cpu.background import (
+    background_cpu_turn, poll_background_cpu, background_busy, cancel_background_cpu,
+    close_background_cpu, observe_background,
+)
+from logic_cpu.cooperative import (
+    cooperative_cpu_turn, step_cooperative_cpu, cooperative_busy, cancel_cooperative_cpu,
+    observe_cooperative, last_slice_stats,
+)
+
+CPU_MODES = {
+    "greedy": cpu_turn,
+    "joint": joint_cpu_turn,
+    "alphabeta": alphabeta_cpu_turn,
+    "mcts": mcts_cpu_turn,
+    "parallel": parallel_cpu_turn,
+    "background": background_cpu_turn,
+    "cooperative": cooperative_cpu_turn,
+}
+
+
+def get_cpu_turn(mode="greedy"):
+    try:
+        return CPU_MODES[mode]
+    except KeyError:
+        raise ValueError(f"unknown CPU mode {mode!r}, expected one of {sorted(CPU_MODES)}")
+
+
+# Every function below works on the game played on `grid`; its CPU
+# memory (logic_cpu/memory.py) is found with CPUMemory.for_grid.
+def notify_player_action(grid, action):
+    """The player just played `action` (an actions.Move / Attack)."""
+    memory = CPUMemory.for_grid(grid)
+    observe_player_action(memory, action)
+    observe_background(memory, action)
+    observe_cooperative(memory, action)
+
+
+def cpu_update(grid, frame_start=None):
+    """
+    Once per frame, after drawing: advance a cooperative decision with
+    the rest of the frame (frame_start = time.perf_counter() at its
+    start) or collect a background one. True if an action was played.
+    """
+    memory = CPUMemory.for_grid(grid)
+    played = poll_background_cpu(grid, memory)
+    return step_cooperative_cpu(grid, memory, frame_start) or played
+
+
+def cpu_busy(grid):
+    """A background / cooperative decision is still being computed."""
+    memory = CPUMemory.for_grid(grid)
+    return background_busy(memory) or cooperative_busy(memory)
+
+
+def cancel_cpu(grid):
+    """Drop any decision in progress (reset)."""
+    memory = CPUMemory.for_grid(grid)
+    cancel_background_cpu(memory)
+    cancel_cooperative_cpu(memory)
+
+
+def close_cpu(grid):
+    """Drop any decision in progress and stop the CPU's worker thread (quit)."""
+    memory = CPUMemory.for_grid(grid)
+    close_background_cpu(memory)
+    cancel_cooperative_cpu(memory)
+
 
-__all__ = ["cpu_turn"]
+__all__ = [
+    "cpu_turn", "joint_cpu_turn", "alphabeta_cpu_turn", "mcts_cpu_turn", "parallel_cpu_turn",
+    "background_cpu_turn", "cooperative_cpu_turn", "cpu_update", "cpu_busy", "cancel_cpu",
+    "close_cpu",
+    "last_cache_stats", "last_search_stats", "last_mcts_stats", "last_parallel_stats",
+    "last_slice_stats",
+    "CPU_MODES", "CPUMemory", "get_cpu_turn", "notify_player_action",
+]
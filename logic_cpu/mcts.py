@@ -0,0 +1,258 @@
+"""
+mcts.py
+-------
+Monte Carlo Tree Search CPU over the headless rules in
+logic_cpu/simulation.py.
+
+- open-loop UCT: a node is a sequence of actions, not a state; every
+  iteration replays its path from the root with freshly rolled damage,
+  so the -2..2 rolls and the burn / regen ticks are sampled instead of
+  averaged
+- playouts follow greedy_action (greedy_best_target,
+  greedy_element_attack, greedy_nearest_move) for both sides, with a
+  small chance of a random legal action so they don't all agree
+- as many iterations as fit in MCTS_TIME_MS
+- the tree survives between turns: the child the CPU played becomes the
+  root, and once the player's reply is reported with observe() the
+  matching grandchild does, visit counts included
+"""
+
+import math
+import random
+import time
+
+from config import MCTS_TIME_MS
+from logic_cpu.search_turn import search_cpu_turn, searcher_stats
+from logic_cpu.simulation import (
+    sim_board, other_side, legal_actions, apply_action, greedy_action,
+)
+
+UCT_C = 1.4
+PLAYOUT_PLIES = 8       # actions per playout before the position is scored
+RANDOM_PLAYOUT = 0.1    # chance of a random instead of a greedy playout action
+PROGRESS_EVERY = 64     # iterations between progress reports
+
+
+class Node:
+    __slots__ = ("action", "parent", "side", "children", "visits", "wins")
+
+    def __init__(self, action, parent, side):
+        self.action = action
+        self.parent = parent
+        self.side = side        # who played `action`; wins are counted for them
+        self.children = {}      # action -> Node
+        self.visits = 0
+        self.wins = 0.0
+
+    def size(self):
+        return 1 + sum(child.size() for child in self.children.values())
+
+
+def _most_visited(root, legal=None):
+    return max(
+        (child for a, child in root.children.items() if legal is None or a in legal),
+        key=lambda child: child.visits,
+        default=None,
+    )
+
+
+def _material(state, owner):
+    return sum(u.hp + u.shield + 50 for u in state.units if u.owner == owner)
+
+
+def reward(state, owner):
+    """1 for a win, 0 for a loss, otherwise `owner`'s share of the material."""
+    winner = state.winner()
+    if winner is not None:
+        return 1.0 if winner == owner else 0.0
+    mine = _material(state, owner)
+    return mine / (mine + _material(state, other_side(owner)))
+
+
+# --------------------------------------------------
+# SEARCH
+# --------------------------------------------------
+class MCTSCPU:
+    def __init__(self, time_ms=MCTS_TIME_MS, seed=None, max_iterations=None):
+        self.time_ms = time_ms
+        self.max_iterations = max_iterations  # fixed work instead of a time budget
+        self.rng = random.Random(seed)
+        self.root = None
+        self.last_stats = {}
+        self._played = None     # expected state after the CPU's last action
+        self._expected = None   # {unit key: pos} once the reply is observed
+
+    def reset(self):
+        self.root = None
+        self._played = self._expected = None
+
+    def choose(self, state, stop=None, progress=None):
+        """
+        Most visited action for state.to_move, or None if it has none.
+        stop (a threading.Event) ends the search early; progress is
+        called now and then with the current most visited action.
+        """
+        start = time.perf_counter()
+        legal = set(legal_actions(state))
+        root, iterations, reused = self.search(state, stop, progress, legal)
+        return self._pick(state, root, legal, iterations, reused, time.perf_counter() - start)
+
+    def steps(self, state):
+        """
+        choose() as a generator for cooperative scheduling: it yields
+        after every iteration and returns the action (StopIteration
+        value). Only time spent inside the generator counts against
+        time_ms, so thinking can be spread over many frames.
+        """
+        legal = set(legal_actions(state))
+        root, reused = self._root_for(state)
+        iterations, spent = 0, 0.0
+        while True:
+            t0 = time.perf_counter()
+            self._iterate(root, state)
+            iterations += 1
+            spent += time.perf_counter() - t0
+            if self.max_iterations is not None:
+                if iterations >= self.max_iterations:
+                    break
+            elif spent * 1000 >= self.time_ms:
+                break
+            yield
+        return self._pick(state, root, legal, iterations, reused, spent)
+
+    def search(self, state, stop=None, progress=None, legal=None):
+        """
+        Grow the tree for `state` until the time budget (or
+        max_iterations) runs out or `stop` is set. Returns (root,
+        iterations, visits the root already had from the previous turn).
+        """
+        deadline = time.perf_counter() + self.time_ms / 1000
+        root, reused = self._root_for(state)
+
+        iterations = 0
+        while True:
+            self._iterate(root, state)
+            iterations += 1
+            if progress is not None and not iterations % PROGRESS_EVERY:
+                best = _most_visited(root, legal)
+                if best is not None:
+                    progress(best.action)
+            if self.max_iterations is not None:
+                if iterations >= self.max_iterations:
+                    break
+            elif time.perf_counter() > deadline:
+                break
+            if stop is not None and stop.is_set():
+                break
+        return root, iterations, reused
+
+    def _root_for(self, state):
+        root = self.root if self._reusable(state) else None
+        if root is None:
+            root = Node(None, None, other_side(state.to_move))
+        root.parent = None
+        return root, root.visits
+
+    def _pick(self, state, root, legal, iterations, reused, elapsed):
+        best = _most_visited(root, legal)
+        if best is None:
+            action = greedy_action(sim_board(state), state.to_move)
+            self.reset()
+        else:
+            action = best.action
+            self.root = best
+            self._played = apply_action(state, action)
+            self._expected = None
+
+        self.last_stats = {
+            "iterations": iterations,
+            "seconds": elapsed,
+            "playouts_per_sec": iterations / elapsed if elapsed else 0.0,
+            "reused_visits": reused,
+            "root_visits": root.visits,
+            "best_visits": best.visits if best else 0,
+            "best_value": best.wins / best.visits if best else 0.0,
+        }
+        return action
+
+    def observe(self, action):
+        """The opponent played `action`: descend into it if it was explored."""
+        root, played = self.root, self._played
+        child = root.children.get(action) if root is not None else None
+        if child is None or action.src not in played.occupancy():
+            self.reset()
+            return
+        self.root = child
+        self._expected = {u.key: u.pos for u in apply_action(played, action).units}
+
+    def _reusable(self, state):
+        if self.root is None or self._expected is None:
+            return False
+        if self.root.side == state.to_move:
+            return False
+        expected = self._expected
+        return all(expected.get(u.key, u.pos) == u.pos for u in state.units)
+
+    def _iterate(self, root, state):
+        rng = self.rng
+        node, s = root, state
+
+        # selection / expansion
+        while s.winner() is None:
+            actions = legal_actions(s)
+            if not actions:
+                break
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                action = rng.choice(untried)
+                child = node.children[action] = Node(action, node, s.to_move)
+                node, s = child, apply_action(s, action, rng)
+                break
+            log_n = math.log(node.visits)
+            node = max((node.children[a] for a in actions),
+                       key=lambda ch: ch.wins / ch.visits + UCT_C * math.sqrt(log_n / ch.visits))
+            s = apply_action(s, node.action, rng)
+
+        # playout
+        for _ in range(PLAYOUT_PLIES):
+            if s.winner() is not None:
+                break
+            action = self._playout_action(s)
+            if action is None:
+                break
+            s = apply_action(s, action, rng)
+
+        # backpropagation
+        value = reward(s, state.to_move)
+        while node is not None:
+            node.visits += 1
+            node.wins += value if node.side == state.to_move else 1.0 - value
+            node = node.parent
+
+    def _playout_action(self, state):
+        rng = self.rng
+        if rng.random() >= RANDOM_PLAYOUT:
+            action = greedy_action(sim_board(state), state.to_move, rng)
+            if action is not None:
+                return action
+        actions = legal_actions(state)
+        return rng.choice(actions) if actions else None
+
+
+def mcts_cpu_turn(grid, memory=None):
+    """Search the enemy's action with MCTS and play it on the live grid."""
+    search_cpu_turn(grid, memory, "mcts",
+                    lambda seed: MCTSCPU(seed=seed),
+                    lambda cpu, state: cpu.choose(state))
+
+
+def observe_player_action(memory, action):
+    """Let the game's MCTS tree follow the player's move (keeps it for next turn)."""
+    searcher = memory.existing("mcts")
+    if searcher is not None:
+        searcher.observe(action)
+
+
+def last_mcts_stats(grid):
+    """iterations / seconds / playouts_per_sec / tree reuse of the game's last search."""
+    return searcher_stats(grid, "mcts")
@@ -0,0 +1,51 @@
+"""
+memory.py
+---------
+Per-game CPU state. Everything a CPU controller remembers between turns
+lives on one CPUMemory per game instead of in module globals, so one
+process can run any number of games side by side:
+
+- the greedy controller's "human-like" memory (focus target, threatened
+  ally, turn counter) and its last TurnCache
+- the search controllers (alpha-beta transposition table, MCTS tree,
+  background / cooperative drivers), created on first use
+
+Pass a CPUMemory to cpu_turn explicitly, or let CPUMemory.for_grid(grid)
+find the one that belongs to the game on that grid.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CPUMemory:
+    last_attacked_enemy: tuple = None
+    last_attacked_turn: int = -1
+    current_turn: int = 0
+
+    threatened_ally: tuple = None
+    threatened_turn: int = -1
+
+    last_turn_cache: object = None  # TurnCache of the last greedy turn
+    searchers: dict = field(default_factory=dict)
+
+    @classmethod
+    def for_grid(cls, grid):
+        """The memory of the game played on `grid`, created on first use."""
+        # kept on the grid: the memory's TurnCache holds the grid, so a
+        # WeakKeyDictionary entry would keep the game alive for good
+        memory = grid.cpu_memory
+        if memory is None:
+            memory = grid.cpu_memory = cls()
+        return memory
+
+    def searcher(self, name, factory):
+        """The game's search controller `name`, built with factory() once."""
+        s = self.searchers.get(name)
+        if s is None:
+            s = self.searchers[name] = factory()
+        return s
+
+    def existing(self, name):
+        """The search controller `name` if this game has used it, else None."""
+        return self.searchers.get(name)
@@ -0,0 +1,240 @@
+"""
+parallel.py
+-----------
+Root-parallel MCTS: every worker process grows its own tree from the
+same position for the whole time budget, with its own seed, and the
+root visit counts are summed. Total playouts grow with the number of
+cores while the turn still takes MCTS_TIME_MS.
+
+- the worker pool is created once and kept warm between turns
+  (imports done, specs cached per game)
+- states travel as a flat int32 array (encode_state / decode_state);
+  the unit specs, which never change during a game, are pickled once
+  per game on this side and unpickled once per worker. The pickled
+  specs (well under 1 KB for 3v3) still ride along with every task:
+  the pool outlives games, so a pool initializer can't hand them over
+- workers=1 searches in this process without a pool; with a seed and
+  a fixed iteration count that is fully deterministic (tests, replays)
+- if the pool can't be started or breaks (a worker died), the turn is
+  searched by one in-process search with the normal time budget, so a
+  missing pool never stalls the frame for workers x MCTS_TIME_MS
+- the pool uses the platform's default start method; nothing is
+  inherited from the parent, since every task carries its state and
+  specs as bytes. With "spawn" (macOS, Windows) workers import the
+  game script as __mp_main__, so main.py only opens its window and
+  runs the loop under `if __name__ == "__main__"`
+"""
+
+import atexit
+import os
+import pickle
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from hashlib import md5
+
+from config import CPU_WORKERS, MCTS_TIME_MS
+from logic_cpu.search_turn import search_cpu_turn, searcher_stats
+from logic_cpu.simulation import (
+    PLAYER, ENEMY, SimState, SimUnit, sim_board, legal_actions, greedy_action,
+)
+
+OWNERS = (PLAYER, ENEMY)
+EFFECT_KINDS = ("regen", "burn")
+
+
+# --------------------------------------------------
+# COMPACT STATE ENCODING
+# --------------------------------------------------
+def encode_state(state):
+    """
+    int32 words: cols, rows, to_move, #units, #flames, #effects, then
+    owner, index, c, r, hp, shield, healed_once per unit,
+    c, r, frames_left, owner per flame and
+    kind, owner, index, per_tick, frames_left per effect.
+    """
+    words = array("i", (
+        state.cols, state.rows, OWNERS.index(state.to_move),
+        len(state.units), len(state.flames), len(state.effects),
+    ))
+    for u in state.units:
+        words.extend((OWNERS.index(u.owner), u.index, u.pos[0], u.pos[1],
+                      u.hp, u.shield, int(u.healed_once)))
+    for c, r, t, owner in state.flames:
+        words.extend((c, r, t, OWNERS.index(owner)))
+    for kind, (owner, index), per_tick, t in state.effects:
+        words.extend((EFFECT_KINDS.index(kind), OWNERS.index(owner), index, per_tick, t))
+    return words.tobytes()
+
+
+def decode_state(blob, specs):
+    words = array("i")
+    words.frombytes(blob)
+    cols, rows, to_move, n_units, n_flames, n_effects = words[:6]
+    i = 6
+
+    units = []
+    for _ in range(n_units):
+        owner, index, c, r, hp, shield, healed = words[i:i + 7]
+        units.append(SimUnit(OWNERS[owner], index, (c, r), hp, shield, bool(healed)))
+        i += 7
+    flames = []
+    for _ in range(n_flames):
+        c, r, t, owner = words[i:i + 4]
+        flames.append((c, r, t, OWNERS[owner]))
+        i += 4
+    effects = []
+    for _ in range(n_effects):
+        kind, owner, index, per_tick, t = words[i:i + 5]
+        effects.append((EFFECT_KINDS[kind], (OWNERS[owner], index), per_tick, t))
+        i += 5
+
+    return SimState(cols, rows, tuple(units), tuple(flames), tuple(effects),
+                    OWNERS[to_move], specs)
+
+
+# --------------------------------------------------
+# WORKER SIDE
+# --------------------------------------------------
+_worker_specs = {}  # specs key -> specs, per process (unpickled once)
+
+
+def _warm():
+    # pay for the imports before the first turn, not during it
+    import logic_cpu.mcts  # noqa: F401
+
+
+def _ping():
+    return os.getpid()
+
+
+def rollouts(blob, specs_key, specs_blob, time_ms, iterations, seed):
+    """One worker's search: (iterations, {action: (visits, wins)})."""
+    from logic_cpu.mcts import MCTSCPU
+
+    specs = _worker_specs.get(specs_key)
+    if specs is None:
+        specs = _worker_specs[specs_key] = pickle.loads(specs_blob)
+    state = decode_state(blob, specs)
+
+    root, n, _ = MCTSCPU(time_ms, seed, iterations).search(state)
+    return n, {a: (child.visits, child.wins) for a, child in root.children.items()}
+
+
+# --------------------------------------------------
+# POOL
+# --------------------------------------------------
+_pool = None
+_pool_size = 0
+
+
+def get_pool(workers):
+    """The shared warm pool, (re)created when the size changes."""
+    global _pool, _pool_size
+    if _pool is not None and _pool_size == workers:
+        return _pool
+    shutdown_pool()
+    _pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_warm,
+    )
+    _pool_size = workers
+    # start every worker now instead of on the first turn
+    for f in [_pool.submit(_ping) for _ in range(workers)]:
+        f.result()
+    return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+    _pool, _pool_size = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+# --------------------------------------------------
+# SEARCH
+# --------------------------------------------------
+class ParallelMCTS:
+    def __init__(self, workers=CPU_WORKERS, time_ms=MCTS_TIME_MS, seed=None,
+                 iterations=None):
+        workers = workers or os.cpu_count() or 1
+        self.workers = workers
+        self.time_ms = time_ms
+        self.iterations = iterations  # per worker; None = use the time budget
+        self.rng = random.Random(seed)
+        self.last_stats = {}
+        self._specs = (None, None, None)  # (specs, key, pickled)
+
+    def choose(self, state):
+        """Most visited action over all workers, or None if there is none."""
+        start = time.perf_counter()
+        blob = encode_state(state)
+        key, specs_blob = self._pickled_specs(state.specs)
+        jobs = [
+            (blob, key, specs_blob, self.time_ms, self.iterations, self.rng.getrandbits(32))
+            for _ in range(self.workers)
+        ]
+
+        results = None
+        if self.workers > 1:
+            try:
+                pool = get_pool(self.workers)
+                results = [f.result() for f in [pool.submit(rollouts, *job) for job in jobs]]
+            except (BrokenProcessPool, OSError):
+                # no usable pool (a worker died, or processes can't be
+                # started here): drop it and search this turn in-process
+                shutdown_pool()
+        if results is None:
+            results = [rollouts(*jobs[0])]
+
+        visits, wins, total = {}, {}, 0
+        for n, children in results:
+            total += n
+            for action, (v, w) in children.items():
+                visits[action] = visits.get(action, 0) + v
+                wins[action] = wins.get(action, 0.0) + w
+
+        # legal_actions order breaks ties, so the pick doesn't depend on
+        # the order the workers happened to report in
+        best = max(
+            (a for a in legal_actions(state) if a in visits),
+            key=lambda a: (visits[a], wins[a]),
+            default=None,
+        )
+        if best is None:
+            best = greedy_action(sim_board(state), state.to_move)
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "workers": len(results),
+            "iterations": total,
+            "seconds": elapsed,
+            "playouts_per_sec": total / elapsed if elapsed else 0.0,
+            "state_bytes": len(blob),
+            "best_visits": visits.get(best, 0),
+        }
+        return best
+
+    def _pickled_specs(self, specs):
+        if self._specs[0] is not specs:
+            data = pickle.dumps(specs)
+            self._specs = (specs, md5(data).hexdigest(), data)
+        return self._specs[1], self._specs[2]
+
+
+def parallel_cpu_turn(grid, memory=None):
+    """Root-parallel MCTS over CPU_WORKERS processes, played on the live grid."""
+    search_cpu_turn(grid, memory, "parallel",
+                    lambda seed: ParallelMCTS(seed=seed),
+                    lambda cpu, state: cpu.choose(state))
+
+
+def last_parallel_stats(grid):
+    """workers / iterations / playouts_per_sec of the game's last parallel search."""
+    return searcher_stats(grid, "parallel")
@@ -0,0 +1,66 @@
+"""
+search_turn.py
+--------------
+The glue every search CPU mode (alphabeta, mcts, parallel, background,
+cooperative) shares: find the game's searcher in its CPUMemory, read
+the live board into a SimState and play the action the search picked.
+
+Each mode only says how to build its searcher and how to run it:
+
+    def mcts_cpu_turn(grid, memory=None):
+        search_cpu_turn(grid, memory, "mcts",
+                        lambda seed: MCTSCPU(seed=seed),
+                        lambda cpu, state: cpu.choose(state))
+
+`search` returns the action to play now, or None (nothing to play, or
+the background / cooperative drivers, which play it themselves later).
+"""
+
+from game_rng import GameRNG
+from logic_cpu.memory import CPUMemory
+from logic_cpu.simulation import ENEMY, state_from_grid
+
+
+def live_sim_state(grid):
+    """The live game as a SimState with the enemy to move, None once it is over."""
+    from effects import live_state
+
+    game = live_state(grid)
+    state = state_from_grid(grid, game.flame_tiles, game.regen_effects,
+                            game.burn_effects, ENEMY)
+    return state if state.winner() is None else None
+
+
+def search_cpu_turn(grid, memory, name, factory, search):
+    """
+    One enemy turn with the game's searcher `name`, built on first use
+    with factory(seed) (seeded from the game's rng): search(searcher,
+    state) picks the action, which is played with the move / attack
+    animations.
+    """
+    from animations import anim_mgr
+    from logic_cpu.cpu_controller import execute_action
+
+    if anim_mgr.blocking:
+        return
+    if memory is None:
+        memory = CPUMemory.for_grid(grid)
+    seed = GameRNG.for_grid(grid).seed_for(name)
+    searcher = memory.searcher(name, lambda: factory(seed))
+
+    state = live_sim_state(grid)
+    if state is None:
+        # a finished game's tree / table is no use to the next one
+        if hasattr(searcher, "reset"):
+            searcher.reset()
+        return
+
+    action = search(searcher, state)
+    if action is not None:
+        execute_action(grid, action)
+
+
+def searcher_stats(grid, name):
+    """A copy of last_stats of the game's searcher `name` ({} if unused)."""
+    searcher = CPUMemory.for_grid(grid).existing(name)
+    return dict(searcher.last_stats) if searcher else {}
@@ -0,0 +1,271 @@
+"""
+simulation.py
+-------------
+Immutable game positions for the search-based CPUs, played with the
+rules in engine.py.
+
+A SimState is a small hashable-friendly record (units, flames, effects,
+side to move) that search trees and tables can keep; apply_action
+returns a new one. Nothing here re-implements a rule: each thread keeps
+one scratch engine.GameState per game, a SimState is loaded into it
+with engine.restore, the action is resolved by engine.apply and the
+result is read back off the board. Loading the state the last call
+produced is free, so a line of play costs one engine.apply per action.
+
+Compared to the live game:
+
+- damage rolls use their expected value (the -2..2 variance averages
+  out), unless apply_action is given an rng to roll them with
+- every action is followed by TICKS_PER_TURN frames of effect ticks,
+  the length of one attack animation
+
+sim_board(state) is the scratch Grid holding a state, so the greedy
+heuristics (written against Grid) can pick playout actions; sim_game(state)
+is the whole scratch GameState, for searches that play and undo actions
+on it with engine.snapshot / restore instead of building new SimStates.
+"""
+
+import threading
+from typing import NamedTuple, Tuple
+
+import engine
+from actions import Move, Attack
+from card import Card
+from engine import PLAYER, ENEMY, other_side
+from grid import Grid
+
+TICKS_PER_TURN = engine.ACTION_FRAMES  # frames of effects between two actions
+
+
+class UnitSpec(NamedTuple):
+    """The parts of a Card that never change during a game."""
+    max_hp: int
+    attacks: tuple
+    move_range: int
+    element: str
+    rarity: str
+
+
+class SimUnit(NamedTuple):
+    owner: str
+    index: int
+    pos: Tuple[int, int]
+    hp: int
+    shield: int
+    healed_once: bool
+
+    @property
+    def key(self):
+        return (self.owner, self.index)
+
+
+class SimState:
+    """
+    units:   tuple of SimUnit
+    flames:  tuple of (col, row, frames_left, owner)
+    effects: tuple of (kind, unit key, per_tick, frames_left), kind is
+             "regen" or "burn"
+    specs:   {unit key: UnitSpec}, shared between all states of a game
+    """
+    __slots__ = ("cols", "rows", "units", "flames", "effects",
+                 "to_move", "specs", "_occ")
+
+    def __init__(self, cols, rows, units, flames, effects, to_move, specs):
+        self.cols = cols
+        self.rows = rows
+        self.units = units
+        self.flames = flames
+        self.effects = effects
+        self.to_move = to_move
+        self.specs = specs
+        self._occ = None
+
+    def occupancy(self):
+        """{pos: SimUnit}"""
+        if self._occ is None:
+            self._occ = {u.pos: u for u in self.units}
+        return self._occ
+
+    def side(self, owner):
+        return [u for u in self.units if u.owner == owner]
+
+    def winner(self):
+        owners = {u.owner for u in self.units}
+        if PLAYER not in owners:
+            return ENEMY
+        if ENEMY not in owners:
+            return PLAYER
+        return None
+
+
+# --------------------------------------------------
+# BUILD FROM THE LIVE GAME
+# --------------------------------------------------
+def state_from_grid(grid, flame_tiles=(), regen_effects=(), burn_effects=(), to_move=ENEMY):
+    specs = {}
+    units = []
+    for c, r, card in grid.occupied():
+        key = (card.owner, card.index)
+        specs[key] = UnitSpec(card.max_hp, tuple(card.attacks), card.move_range,
+                              card.element, card.rarity)
+        units.append(SimUnit(card.owner, card.index, (c, r), card.hp,
+                             card.shield, card.healed_once))
+
+    flames = tuple((ft[0], ft[1], ft[2], ft[3]) for ft in flame_tiles)
+    effects = []
+    for kind, lst in (("regen", regen_effects), ("burn", burn_effects)):
+        for card, per_tick, t, _pos in lst:
+            if card.hp > 0:
+                effects.append((kind, (card.owner, card.index), per_tick, t))
+
+    return SimState(grid.cols, grid.rows, tuple(units), flames, tuple(effects),
+                    to_move, specs)
+
+
+# --------------------------------------------------
+# SCRATCH GAME (one per thread)
+# --------------------------------------------------
+class _Rolls:
+    """
+    What engine.attack reads of a GameRNG (rng.combat.randint): the
+    rolls of `rng`, or without one the expected roll, 0.
+    """
+    __slots__ = ("combat",)
+
+    def __init__(self, rng=None):
+        self.combat = self if rng is None else rng
+
+    def randint(self, a, b):
+        return (a + b) // 2
+
+
+_EXPECTED = _Rolls()
+_local = threading.local()
+
+
+class _Scratch:
+    """A GameState with one Card per unit of a game, to play SimStates on."""
+
+    def __init__(self, state):
+        self.specs = state.specs
+        self.game = engine.GameState(Grid(state.cols, state.rows), rng=_EXPECTED)
+        self.cards = {
+            key: Card(key[0], f"{key[0]}{key[1]}", spec.max_hp, spec.max_hp,
+                      list(spec.attacks), spec.move_range, spec.element, key[1],
+                      rarity=spec.rarity)
+            for key, spec in state.specs.items()
+        }
+        self.loaded = None  # the SimState the board holds right now
+
+    def load(self, state):
+        if state is self.loaded:
+            return self.game
+        cards = self.cards
+        units = []
+        pos = {}
+        for u in state.units:
+            units.append((cards[u.key], u.pos[0], u.pos[1], u.hp, u.shield, u.healed_once))
+            pos[u.key] = u.pos
+        regen, burn = [], []
+        for kind, key, per_tick, t in state.effects:
+            (regen if kind == "regen" else burn).append((cards[key], per_tick, t, pos[key]))
+        engine.restore(self.game, engine.Snapshot(
+            tuple(units), state.flames, tuple(regen), tuple(burn), state.to_move, 0,
+        ))
+        self.loaded = state
+        return self.game
+
+    def save(self):
+        """The board as a new SimState (which then counts as loaded)."""
+        game = self.game
+        units = tuple(
+            SimUnit(card.owner, card.index, (c, r), card.hp, card.shield, card.healed_once)
+            for c, r, card in game.grid.occupied()
+        )
+        effects = tuple(
+            (kind, (e[0].owner, e[0].index), e[1], e[2])
+            for kind, lst in (("regen", game.regen_effects), ("burn", game.burn_effects))
+            for e in lst if e[0].hp > 0
+        )
+        state = self.loaded = SimState(
+            game.grid.cols, game.grid.rows, units, tuple(map(tuple, game.flame_tiles)),
+            effects, game.to_move, self.specs,
+        )
+        return state
+
+
+def _scratch(state):
+    scratch = getattr(_local, "scratch", None)
+    if scratch is None or scratch.specs is not state.specs:
+        scratch = _local.scratch = _Scratch(state)
+    return scratch
+
+
+# --------------------------------------------------
+# RULES (engine.py)
+# --------------------------------------------------
+def legal_actions(state):
+    return engine.legal_actions(_scratch(state).load(state))
+
+
+def apply_action(state, action, rng=None):
+    """
+    New state after `action` and one turn of effect ticks. With an rng
+    (random.Random) damage is rolled like the live game instead of
+    taking the expected value.
+    """
+    scratch = _scratch(state)
+    game = scratch.load(state)
+    game.rng = _EXPECTED if rng is None else _Rolls(rng)
+    engine.apply(game, action, TICKS_PER_TURN)
+    return scratch.save()
+
+
+def sim_board(state):
+    """
+    The scratch Grid holding `state`, for read-only Grid code (the
+    greedy heuristics). Valid until the next simulation call on this
+    thread.
+    """
+    return _scratch(state).load(state).grid
+
+
+def sim_game(state):
+    """
+    The scratch engine.GameState holding `state`, rolling expected
+    damage. Callers may play on it but must restore it to `state`
+    before the next simulation call on this thread.
+    """
+    game = _scratch(state).load(state)
+    game.rng = _EXPECTED
+    return game
+
+
+# --------------------------------------------------
+# GREEDY POLICY
+# --------------------------------------------------
+def greedy_action(board, side, rng=None):
+    """
+    The action the greedy heuristics would play for `side` on a Grid (the
+    live one or a sim_board): the first unit with its preferred target in
+    range attacks, otherwise one unit (the first, or a random one with an
+    rng) closes in. None if nothing sensible is found.
+    """
+    from logic_cpu.greedy_target_weakest import greedy_best_target
+    from logic_cpu.greedy_element import greedy_element_attack
+    from logic_cpu.greedy_move import greedy_nearest_move
+
+    mine, theirs = board.units(side), board.units(other_side(side))
+    if not mine or not theirs:
+        return None
+
+    for pos in mine:
+        card = board.card_at(*pos)
+        target = greedy_best_target(pos, theirs, board)
+        atk = greedy_element_attack(card, target, board) if target else None
+        if atk and abs(pos[0] - target[0]) + abs(pos[1] - target[1]) <= atk.attack_range:
+            return Attack(pos, card.attacks.index(atk), target)
+
+    pos = rng.choice(mine) if rng else mine[0]
+    new_pos = greedy_nearest_move(pos, theirs, board, board.card_at(*pos).move_range)
+    return Move(pos, new_pos) if new_pos != pos else None
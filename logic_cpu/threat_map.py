@@ -0,0 +1,84 @@
+# threat_map.py
+"""
+Threat map: expected incoming damage on every tile from all attacks of
+all opposing units, built once per CPU turn.
+
+Per opposing unit and tile at distance d:
+- if any attack reaches (attack_range >= d): 2 * the best such attack's dmg
+- otherwise: its strongest attack's dmg / d (fall-off for far threats)
+
+With a single attack this is exactly the old greedy_escape_move score.
+Uses NumPy for the whole-board array when it is installed; without it
+(or on a SparseGrid) tiles are evaluated on first read and memoized.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _profile(card):
+    """(attack_range, dmg) pairs, longest range first, plus the max dmg."""
+    attacks = sorted(((a.attack_range, a.dmg) for a in card.attacks), reverse=True)
+    return attacks, max((dmg for _, dmg in attacks), default=0)
+
+
+class ThreatMap:
+    def __init__(self, grid, sources):
+        self.grid = grid
+        self.units = []  # (pos, [(range, dmg), ...], max dmg)
+        self.unit_dmg = {}  # pos -> max dmg, for unit_damage
+        for (c, r) in sources:
+            card = grid.card_at(c, r)
+            if card:
+                profile = _profile(card)
+                self.units.append(((c, r), *profile))
+                self.unit_dmg[(c, r)] = profile[1]
+
+        self.array = None
+        self._memo = {}
+        if np is not None and not grid.sparse:
+            self.array = self._build_array()
+
+    def at(self, pos):
+        if self.array is not None:
+            return float(self.array[pos[0], pos[1]])
+        value = self._memo.get(pos)
+        if value is None:
+            value = self._memo[pos] = self._tile_threat(pos)
+        return value
+
+    def unit_damage(self, pos):
+        """Strongest attack of the opposing unit on pos (0 if none)."""
+        return self.unit_dmg.get(pos, 0)
+
+    # ------------------------------
+    # BUILDERS
+    # ------------------------------
+    def _tile_threat(self, pos):
+        c, r = pos
+        threat = 0.0
+        for (px, py), attacks, max_dmg in self.units:
+            d = abs(px - c) + abs(py - r)
+            in_range = max((dmg for rng, dmg in attacks if rng >= d), default=None)
+            if in_range is not None:
+                threat += in_range * 2
+            else:
+                threat += max_dmg / max(d, 1)
+        return threat
+
+    def _build_array(self):
+        cols, rows = self.grid.cols, self.grid.rows
+        col_idx = np.arange(cols)[:, None]
+        row_idx = np.arange(rows)[None, :]
+        total = np.zeros((cols, rows))
+
+        for (px, py), attacks, max_dmg in self.units:
+            d = np.abs(col_idx - px) + np.abs(row_idx - py)
+            best = np.full((cols, rows), -1.0)
+            for rng, dmg in attacks:
+                best = np.where(d <= rng, np.maximum(best, dmg), best)
+            total += np.where(best >= 0, best * 2, max_dmg / np.maximum(d, 1))
+
+        return total
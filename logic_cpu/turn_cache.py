@@ -0,0 +1,86 @@
+"""
+turn_cache.py
+-------------
+Turn-scoped memo for the CPU heuristics.
+
+One cpu_turn asks the same questions many times: greedy_best_target for
+an enemy in enemy_priority, calculate_attack_score, the panic branch and
+the normal attack branch; greedy_element_attack for the same
+(attacker, target) pairs. A TurnCache answers each question once.
+
+Entries are keyed on grid.version and dropped as soon as the occupancy
+changes. Hp / shield changes don't bump the version; they only happen
+in animation callbacks and effect ticks, i.e. between turns, and every
+turn starts with a fresh cache.
+"""
+
+from logic_cpu.greedy_element import greedy_element_attack
+from logic_cpu.greedy_escape import greedy_escape_move
+from logic_cpu.greedy_move import greedy_nearest_move
+from logic_cpu.greedy_target_weakest import greedy_best_target
+
+
+class TurnCache:
+    def __init__(self, grid, field=None, threat=None, maps=None):
+        self.grid = grid
+        self.field = field
+        self.threat = threat
+        self.maps = maps
+        self.version = grid.version
+        self.hits = 0
+        self.misses = 0
+        self._memo = {}
+
+    def _lookup(self, key, compute):
+        if self.grid.version != self.version:
+            self._memo.clear()
+            self.version = self.grid.version
+        try:
+            value = self._memo[key]
+        except KeyError:
+            self.misses += 1
+            value = self._memo[key] = compute()
+            return value
+        self.hits += 1
+        return value
+
+    # ------------------------------
+    # HEURISTICS
+    # ------------------------------
+    def best_target(self, e_pos, players):
+        return self._lookup(
+            ("target", e_pos, tuple(players)),
+            lambda: greedy_best_target(e_pos, players, self.grid, self.threat),
+        )
+
+    def element_attack(self, e_card, target_pos):
+        return self._lookup(
+            ("element", id(e_card), target_pos),
+            lambda: greedy_element_attack(e_card, target_pos, self.grid),
+        )
+
+    def nearest_move(self, e_pos, players, move_range):
+        # the turn's field is only valid for the players it was built from
+        field = self.field
+        if field is not None and field.sources != list(players):
+            field = None
+        return self._lookup(
+            ("nearest", e_pos, tuple(players), move_range),
+            lambda: greedy_nearest_move(e_pos, players, self.grid, move_range, field),
+        )
+
+    def escape_move(self, e_pos, players, move_range):
+        return self._lookup(
+            ("escape", e_pos, tuple(players), move_range),
+            lambda: greedy_escape_move(e_pos, players, self.grid, move_range,
+                                       self.threat, self.maps),
+        )
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._memo),
+        }
@@ -0,0 +1,136 @@
+"""
+Movement queries on top of the Grid graph.
+
+Reachability caches obstacle-aware move ranges keyed on (origin, radius).
+A region can only change when a tile inside its Manhattan diamond changes,
+so an occupancy change only drops the cached regions around that tile.
+
+PathFinder runs A* (Manhattan heuristic, units block) and keeps an LRU
+cache keyed on (start, goal, occupancy version): any board change bumps
+grid.version, so stale paths are simply never hit again and age out.
+"""
+
+from collections import OrderedDict
+from heapq import heappush, heappop
+
+from grid import bfs_open
+
+MAX_CACHED_REGIONS = 4096
+PATH_CACHE_SIZE = 1024
+
+
+class Reachability:
+    def __init__(self, grid):
+        self.grid = grid
+        self._regions = {}  # (origin, radius) -> frozenset of (c, r)
+        self.hits = 0
+        self.misses = 0
+        grid.add_listener(self._on_change)
+
+    def moves(self, origin, radius):
+        """
+        Tiles a unit on `origin` can reach in `radius` steps without
+        passing through other units. Includes the origin itself.
+        """
+        key = (origin, radius)
+        region = self._regions.get(key)
+        if region is not None:
+            self.hits += 1
+            return region
+
+        self.misses += 1
+        if len(self._regions) >= MAX_CACHED_REGIONS:
+            self._regions.clear()
+
+        region = frozenset(bfs_open(origin, radius, self.grid))
+        self._regions[key] = region
+        return region
+
+    def _on_change(self, c, r):
+        stale = [
+            key for key in self._regions
+            if abs(key[0][0] - c) + abs(key[0][1] - r) <= key[1]
+        ]
+        for key in stale:
+            del self._regions[key]
+
+
+def astar(grid, start, goal, max_cost=None):
+    """
+    Shortest path from start to goal through empty tiles, as a list of
+    (c, r) including both ends, or None. The start tile may be occupied
+    (it is the mover); the goal must be empty. With max_cost set, paths
+    longer than that are not searched for.
+    """
+    if start == goal:
+        return [start]
+
+    rows = grid.rows
+    cells = grid.cells
+    neighbors = grid.neighbors
+
+    s = start[0] * rows + start[1]
+    g = goal[0] * rows + goal[1]
+    if cells[g]:
+        return None
+
+    gc, gr = goal
+    h0 = abs(start[0] - gc) + abs(start[1] - gr)
+    if max_cost is not None and h0 > max_cost:
+        return None
+
+    came_from = {s: -1}
+    cost = {s: 0}
+    heap = [(h0, 0, s)]
+
+    while heap:
+        _, neg_d, i = heappop(heap)
+        d = -neg_d
+        if i == g:
+            path = []
+            while i != -1:
+                path.append(divmod(i, rows))
+                i = came_from[i]
+            path.reverse()
+            return path
+
+        if d > cost[i]:
+            continue
+
+        nd = d + 1
+        for n in neighbors[i]:
+            if cells[n] or nd >= cost.get(n, nd + 1):
+                continue
+            nc, nr = divmod(n, rows)
+            f = nd + abs(nc - gc) + abs(nr - gr)
+            if max_cost is not None and f > max_cost:
+                continue
+            cost[n] = nd
+            came_from[n] = i
+            # ties on f go to the deeper node (closer to the goal)
+            heappush(heap, (f, -nd, n))
+
+    return None
+
+
+class PathFinder:
+    def __init__(self, grid, cache_size=PATH_CACHE_SIZE):
+        self.grid = grid
+        self.cache_size = cache_size
+        self._paths = OrderedDict()  # (start, goal, version, max_cost) -> path
+        self.hits = 0
+        self.misses = 0
+
+    def find(self, start, goal, max_cost=None):
+        key = (start, goal, self.grid.version, max_cost)
+        if key in self._paths:
+            self.hits += 1
+            self._paths.move_to_end(key)
+            return self._paths[key]
+
+        self.misses += 1
+        path = astar(self.grid, start, goal, max_cost)
+        self._paths[key] = path
+        if len(self._paths) > self.cache_size:
+            self._paths.popitem(last=False)
+        return path
@@ -0,0 +1,206 @@
+"""
+replay.py
+---------
+Compact binary game records and a headless replayer.
+
+A replay is everything the rules engine needs to play a game again:
+the seed, the board size and, in order, every placement and every
+Move / Attack as it resolved, with the frames of effect ticks between
+them. The recorder listens on the game's event bus (UnitPlaced,
+ActionPlayed), so it sees exactly the actions main.py and the CPU
+controllers played, at the frame their animation landed.
+
+Layout, all integers unsigned LEB128 varints:
+
+    header   b"CSR" magic, FORMAT_VERSION, engine.RULES_VERSION,
+             seed (zigzag-encoded, seeds may be negative), cols, rows
+    records  TICK    frames
+             PLACE   owner, slot, element, c, r
+             MOVE    src c, src r, dst c, dst r
+             ATTACK  src c, src r, attack_idx, dst c, dst r
+
+A 3v3 game of a hundred-odd actions takes a few hundred bytes.
+
+    rec = ReplayRecorder(state)        # state: engine.GameState
+    ...play...
+    blob = rec.data()
+    final = replay(blob)               # GameState, no pygame
+"""
+
+from typing import NamedTuple
+
+import engine
+from actions import Move, Attack
+from events import UnitPlaced, ActionPlayed
+from game_rng import GameRNG
+from grid import make_grid
+from roster import ELEMENTS, make_card
+
+MAGIC = b"CSR"
+FORMAT_VERSION = 2  # 1: the seed was written as-is (non-negative only)
+
+TICK, PLACE, MOVE, ATTACK = range(4)
+OWNERS = ("player", "enemy")
+
+
+class Place(NamedTuple):
+    owner: str
+    slot: int
+    element: str
+    pos: tuple
+
+
+class ReplayHeader(NamedTuple):
+    rules_version: int
+    seed: int
+    cols: int
+    rows: int
+
+
+# --------------------------------------------------
+# VARINTS
+# --------------------------------------------------
+def write_varint(out, n):
+    """Append n >= 0 to the bytearray `out`, 7 bits per byte."""
+    if n < 0:
+        raise ValueError(f"varints are unsigned, got {n}")
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def read_varint(data, i):
+    """(value, next index) of the varint starting at data[i]."""
+    n = shift = 0
+    while True:
+        b = data[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+def zigzag(n):
+    """Signed -> unsigned: 0, -1, 1, -2, ... map to 0, 1, 2, 3, ..."""
+    return n * 2 if n >= 0 else -n * 2 - 1
+
+
+def unzigzag(n):
+    return n >> 1 if not n & 1 else -(n >> 1) - 1
+
+
+# --------------------------------------------------
+# RECORDING
+# --------------------------------------------------
+class ReplayRecorder:
+    def __init__(self, state):
+        seed = state.rng.seed
+        if not isinstance(seed, int):
+            raise TypeError(f"only integer seeds can be recorded, got {seed!r}")
+        self.state = state
+        self._out = bytearray(MAGIC)
+        for n in (FORMAT_VERSION, engine.RULES_VERSION, zigzag(seed),
+                  state.grid.cols, state.grid.rows):
+            write_varint(self._out, n)
+        self._frame = state.frame
+        state.bus.subscribe(UnitPlaced, self._on_place)
+        state.bus.subscribe(ActionPlayed, self._on_action)
+
+    def close(self):
+        self.state.bus.unsubscribe(UnitPlaced, self._on_place)
+        self.state.bus.unsubscribe(ActionPlayed, self._on_action)
+
+    def data(self):
+        """The replay so far, including the frames since the last action."""
+        self._catch_up()
+        return bytes(self._out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.data())
+
+    def _catch_up(self):
+        frame = self.state.frame
+        if frame > self._frame:
+            self._write(TICK, frame - self._frame)
+            self._frame = frame
+
+    def _write(self, *fields):
+        for n in fields:
+            write_varint(self._out, n)
+
+    def _on_place(self, ev):
+        self._catch_up()
+        card = ev.card
+        self._write(PLACE, OWNERS.index(card.owner), card.index,
+                    ELEMENTS.index(card.element), *ev.pos)
+
+    def _on_action(self, ev):
+        self._catch_up()
+        a = ev.action
+        if isinstance(a, Move):
+            self._write(MOVE, *a.src, *a.dst)
+        else:
+            self._write(ATTACK, *a.src, a.attack_idx, *a.dst)
+
+
+# --------------------------------------------------
+# READING
+# --------------------------------------------------
+def read_replay(data):
+    """(ReplayHeader, records) where records is a list of int frame
+    counts (ticks), Place, Move and Attack in play order."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a replay")
+    i = len(MAGIC)
+    fields = []
+    for _ in range(5):
+        n, i = read_varint(data, i)
+        fields.append(n)
+    if fields[0] not in (1, FORMAT_VERSION):
+        raise ValueError(f"unsupported replay format {fields[0]}")
+    if fields[0] != 1:
+        fields[2] = unzigzag(fields[2])
+    header = ReplayHeader(*fields[1:])
+
+    records = []
+    end = len(data)
+    while i < end:
+        op, i = read_varint(data, i)
+        argc = (1, 5, 4, 5)[op]
+        args = []
+        for _ in range(argc):
+            n, i = read_varint(data, i)
+            args.append(n)
+        if op == TICK:
+            records.append(args[0])
+        elif op == PLACE:
+            owner, slot, element, c, r = args
+            records.append(Place(OWNERS[owner], slot, ELEMENTS[element], (c, r)))
+        elif op == MOVE:
+            records.append(Move((args[0], args[1]), (args[2], args[3])))
+        else:
+            records.append(Attack((args[0], args[1]), args[2], (args[3], args[4])))
+    return header, records
+
+
+def replay(data):
+    """Play a replay headlessly; returns the final GameState."""
+    header, records = read_replay(data)
+    if header.rules_version != engine.RULES_VERSION:
+        raise ValueError(
+            f"replay needs rules version {header.rules_version}, "
+            f"engine is {engine.RULES_VERSION}"
+        )
+    state = engine.GameState(make_grid(header.cols, header.rows), rng=GameRNG(header.seed))
+
+    for rec in records:
+        if isinstance(rec, int):
+            engine.tick(state, rec)
+        elif isinstance(rec, Place):
+            engine.place(state, *rec.pos, make_card(rec.owner, rec.slot, rec.element))
+        else:
+            engine.play(state, rec)
+    return state
@@ -0,0 +1,55 @@
+"""
+roster.py
+---------
+The playable cards: one attack set per element, heroes for the player,
+beasts for the enemy. main.py builds its cards here and the headless
+replayer rebuilds them from (owner, slot, element).
+"""
+
+from attack import Attack
+from card import Card
+
+ELEMENTS = ("fire", "water", "leaf", "null")
+
+
+def element_attacks(element):
+    if element == "fire":
+        return [
+            Attack("Burning Trail", 12, "fire", 5),
+            Attack("Fire Claw", 14, "fire", 4),
+            Attack("Inferno Burst", 16, "fire", 5),
+        ]
+    if element == "water":
+        return [
+            Attack("Water Lash", 10, "water", 5),
+            Attack("Tidal Push", 12, "water", 4),
+            Attack("Healing Wave", 8, "water", 4),
+        ]
+    if element == "leaf":
+        return [
+            Attack("Nature's Embrace", 10, "leaf", 4),
+            Attack("Vine Whip", 12, "leaf", 5),
+            Attack("Thorn Burst", 14, "leaf", 4),
+        ]
+    # null
+    return [
+        Attack("Strike", 12, "null", 4),
+        Attack("Guard Break", 14, "null", 4),
+        Attack("Focused Blow", 16, "null", 3),
+    ]
+
+
+def make_card(owner, slot_index, element):
+    player = owner == "player"
+    card = Card(
+        owner=owner,
+        name=f"{'Hero' if player else 'Beast'} {slot_index+1}",
+        hp=100,
+        max_hp=100,
+        attacks=element_attacks(element),
+        move_range=3 if player else 2,
+        element=element,
+        index=slot_index
+    )
+    card.display_hp = card.hp
+    return card
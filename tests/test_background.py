@@ -0,0 +1,52 @@
+"""A game that is dropped takes its background CPU worker with it."""
+
+import gc
+import time
+import weakref
+
+import pytest
+
+pytest.importorskip("pygame")  # effects / animations draw with it
+
+import engine
+from animations import anim_mgr
+from effects import live_state
+from grid import Grid
+from logic_cpu.background import background_cpu_turn
+from logic_cpu.cpu_controller import cpu_turn
+from logic_cpu.memory import CPUMemory
+from roster import make_card
+
+
+def finish_animations():
+    while anim_mgr.projectiles:
+        anim_mgr.update()
+
+
+def test_dropped_game_ends_its_worker():
+    grid = Grid(12, 8)
+    state = live_state(grid)
+    engine.place(state, 2, 3, make_card("player", 0, "fire"))
+    engine.place(state, 9, 3, make_card("enemy", 0, "water"))
+
+    memory = CPUMemory.for_grid(grid)
+    background_cpu_turn(grid, memory)
+    cpu = memory.existing("background")
+    worker = cpu._worker
+    deadline = time.perf_counter() + 5
+    while cpu._results.empty() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+    # a greedy turn too: its TurnCache on the CPUMemory holds the grid
+    cpu.cancel()
+    cpu_turn(grid, memory)
+    finish_animations()
+    assert memory.last_turn_cache is not None
+
+    ref = weakref.ref(grid)
+    del grid, state, memory, cpu
+    gc.collect()
+
+    assert ref() is None
+    worker.join(timeout=5)
+    assert not worker.is_alive()
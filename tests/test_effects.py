@@ -0,0 +1,35 @@
+"""Every live game keeps its own flames, regen and burns."""
+
+import pytest
+
+pytest.importorskip("pygame")  # effects draws floating texts with it
+
+import engine
+from actions import Attack
+from effects import live_state, process_effects
+from grid import Grid
+from roster import make_card
+
+
+def new_game():
+    grid = Grid(12, 8)
+    state = live_state(grid)
+    engine.place(state, 2, 3, make_card("player", 0, "fire"))
+    engine.place(state, 9, 3, make_card("enemy", 0, "water"))
+    return grid, state
+
+
+def test_effects_stay_in_their_game():
+    grid_a, a = new_game()
+    grid_b, b = new_game()
+    assert a.flame_tiles is not b.flame_tiles
+
+    # Burning Trail leaves flames behind the caster in game A only
+    engine.play(a, Attack((2, 3), 0, (3, 3)))
+    assert a.flame_tiles and not b.flame_tiles
+
+    timers = [ft[2] for ft in a.flame_tiles]
+    for _ in range(10):
+        process_effects(grid_b)
+    assert [ft[2] for ft in a.flame_tiles] == timers
+    assert b.frame == 10 and a.frame == 0
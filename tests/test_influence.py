@@ -0,0 +1,54 @@
+"""Influence maps belong to one game: another game's rules never touch them."""
+
+import engine
+from actions import Attack, Move
+from game_rng import GameRNG
+from grid import Grid
+from influence import InfluenceMaps
+from roster import make_card
+
+
+def new_game(seed):
+    state = engine.GameState(Grid(12, 8), rng=GameRNG(seed))
+    engine.place(state, 2, 3, make_card("player", 0, "fire"))
+    engine.place(state, 9, 3, make_card("enemy", 0, "water"))
+    return state
+
+
+def fresh_maps(state):
+    return InfluenceMaps(state.grid, state.flame_tiles)
+
+
+def test_flames_and_moves_stay_in_their_game():
+    a, b = new_game(1), new_game(2)
+    maps_a, maps_b = InfluenceMaps.for_state(a), InfluenceMaps.for_state(b)
+    before_b = (dict(maps_b.control["player"]), dict(maps_b.control["enemy"]))
+
+    # Burning Trail leaves flames behind the caster in game A only
+    engine.play(a, Attack((2, 3), 0, (3, 3)))
+    engine.play(a, Move((9, 3), (8, 3)))
+    engine.tick(a, 5)
+    assert a.flame_tiles
+
+    assert not any(maps_b.flames.values())
+    assert (maps_b.control["player"], maps_b.control["enemy"]) == before_b
+
+    # A's incrementally kept maps match a rebuild from A's board
+    assert maps_a.flames == fresh_maps(a).flames
+    assert maps_a.control.keys() == fresh_maps(a).control.keys()
+    for owner, layer in fresh_maps(a).control.items():
+        assert layer.keys() == maps_a.control[owner].keys()
+
+
+def test_restore_only_updates_its_own_game():
+    a, b = new_game(1), new_game(2)
+    maps_b = InfluenceMaps.for_state(b)
+    InfluenceMaps.for_state(a)
+
+    snap = engine.snapshot(a)
+    engine.play(a, Attack((2, 3), 0, (3, 3)))
+    engine.restore(a, snap)
+    engine.play(a, Move((2, 3), (2, 5)))
+
+    assert not any(maps_b.flames.values())
+    assert maps_b.control == fresh_maps(b).control
@@ -0,0 +1,38 @@
+"""Joint turn: a self-heal is only planned when it would heal the caster."""
+
+import pytest
+
+pytest.importorskip("pygame")  # joint_turn plays its plan with animations
+
+from actions import Attack
+from grid import Grid
+from logic_cpu.joint_turn import plan_joint_turn
+from roster import make_card
+
+
+def board(element, healed_once=False):
+    grid = Grid(12, 8)
+    enemy = make_card("enemy", 0, element)
+    enemy.hp = 40
+    enemy.healed_once = healed_once
+    player = make_card("player", 0, "fire")
+    player.hp = 10
+    grid.place(5, 3, enemy)
+    grid.place(3, 3, player)
+    return grid
+
+
+def test_water_unit_attacks_instead_of_a_heal_that_does_nothing():
+    # Healing Wave on its own tile heals nobody: finish off the player
+    plan = plan_joint_turn(board("water"))
+    assert len(plan) == 1
+    action = plan[0]
+    assert isinstance(action, Attack) and action.dst == (3, 3)
+
+
+def test_leaf_unit_heals_itself_once():
+    plan = plan_joint_turn(board("leaf"))
+    assert plan == [Attack((5, 3), 0, (5, 3))]   # Nature's Embrace
+
+    plan = plan_joint_turn(board("leaf", healed_once=True))
+    assert len(plan) == 1 and plan[0].dst == (3, 3)
@@ -0,0 +1,51 @@
+"""Root-parallel MCTS: the in-process path and the fallback without a pool."""
+
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from grid import Grid
+from logic_cpu import parallel
+from logic_cpu.parallel import ParallelMCTS
+from logic_cpu.simulation import ENEMY, state_from_grid
+from roster import make_card
+
+
+def position():
+    grid = Grid(12, 8)
+    grid.place(2, 3, make_card("player", 0, "fire"))
+    grid.place(3, 6, make_card("player", 1, "leaf"))
+    grid.place(8, 3, make_card("enemy", 0, "water"))
+    grid.place(9, 5, make_card("enemy", 1, "fire"))
+    return state_from_grid(grid, to_move=ENEMY)
+
+
+def test_one_worker_is_deterministic():
+    state = position()
+    picks = []
+    for _ in range(2):
+        cpu = ParallelMCTS(workers=1, seed=7, iterations=60)
+        picks.append((cpu.choose(state), cpu.last_stats["iterations"],
+                      cpu.last_stats["best_visits"]))
+    assert picks[0] == picks[1]
+    assert picks[0][0] is not None and picks[0][1] == 60
+
+
+class _BrokenPool:
+    def submit(self, *args):
+        raise BrokenProcessPool("a worker died")
+
+
+@pytest.mark.parametrize("error", [OSError, PermissionError, BrokenProcessPool])
+def test_no_pool_falls_back_to_one_search(monkeypatch, error):
+    def get_pool(workers):
+        if error is BrokenProcessPool:
+            return _BrokenPool()
+        raise error("no processes here")
+
+    monkeypatch.setattr(parallel, "get_pool", get_pool)
+    cpu = ParallelMCTS(workers=8, seed=7, iterations=60)
+    assert cpu.choose(position()) is not None
+    # one search's worth of work, not one per worker run back to back
+    assert cpu.last_stats["workers"] == 1
+    assert cpu.last_stats["iterations"] == 60
@@ -0,0 +1,56 @@
+"""Replays round-trip every seed a game can have, negative ones included."""
+
+import pytest
+
+import engine
+from actions import Attack
+from game_rng import GameRNG
+from grid import Grid
+from replay import (MAGIC, ReplayRecorder, read_replay, replay, write_varint,
+                    zigzag)
+from roster import make_card
+
+
+def board(state):
+    return sorted((c, r, card.owner, card.index, card.hp, card.shield)
+                  for c, r, card in state.grid.occupied())
+
+
+def record(seed):
+    state = engine.GameState(Grid(12, 8), rng=GameRNG(seed))
+    recorder = ReplayRecorder(state)
+    engine.place(state, 2, 3, make_card("player", 0, "fire"))
+    engine.place(state, 4, 3, make_card("enemy", 0, "water"))
+    for _ in range(4):
+        engine.apply(state, Attack((2, 3), 0, (4, 3)))
+    return recorder.data(), state
+
+
+@pytest.mark.parametrize("seed", [0, 7, -1, -2**63, 2**64 - 1])
+def test_seed_round_trip(seed):
+    blob, state = record(seed)
+    header, _ = read_replay(blob)
+    assert header.seed == seed
+
+    final = replay(blob)
+    assert final.rng.seed == seed
+    assert board(final) == board(state)
+
+
+def test_format_1_seeds_still_read():
+    old = bytearray(MAGIC)
+    for n in (1, engine.RULES_VERSION, 5, 12, 8):
+        write_varint(old, n)
+    assert read_replay(bytes(old))[0].seed == 5
+
+
+def test_negative_varint_rejected():
+    with pytest.raises(ValueError):
+        write_varint(bytearray(), -1)
+    assert zigzag(-1) == 1 and zigzag(1) == 2
+
+
+def test_non_integer_seed_rejected():
+    state = engine.GameState(Grid(4, 4), rng=GameRNG("match"))
+    with pytest.raises(TypeError):
+        ReplayRecorder(state)
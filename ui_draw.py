@@ -4,9 +4,9 @@ import random
 from config import *
 from colors import *
 from fonts import FONT_BIG, FONT_MAIN
-from grid import cell_center
+from grid import cell_center, bfs_reachable
 from animations import anim_mgr
-from effects import flame_tiles
+from effects import live_state
 
 
 # -------------------------------------------------
@@ -83,6 +83,22 @@ def draw_ui(
 
     screen.fill(C_BG)
 
+    # Move + attack range preview: computed once per frame, not per tile
+    move_reachable = attack_reachable = ()
+    if selected_pos:
+        sc, sr = selected_pos
+        sel_card = grid.card_at(sc, sr)
+        if sel_card and sel_card.owner == "player":
+            # MOVE RANGE (graph-based, other units block the path)
+            move_reachable = grid.reach.moves((sc, sr), sel_card.move_range)
+
+            # ATTACK RANGE (graph-based)
+            max_range = max(atk.attack_range for atk in sel_card.attacks)
+            attack_reachable = bfs_reachable((sc, sr), max_range, grid)
+
+    # burning tiles, looked up once per tile below
+    flames_at = {(ft[0], ft[1]): ft for ft in live_state(grid).flame_tiles}
+
     # =================================================
     # GRID + TILE EFFECTS
     # =================================================
@@ -98,24 +114,24 @@ def draw_ui(
             pygame.draw.rect(screen, C_GRID, rect, 1)
 
             # 🔥 Flame tiles
-            for ft in flame_tiles:
-                if ft[0] == c and ft[1] == r:
-                    alpha = int((ft[2] / (FPS * 3)) * 255)
-                    flame = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-
-                    pygame.draw.circle(
-                        flame,
-                        (*E_FIRE, alpha),
-                        (TILE_SIZE // 2, TILE_SIZE // 2),
-                        TILE_SIZE // 2
-                    )
-                    pygame.draw.circle(
-                        flame,
-                        (255, 200, 50, alpha // 2),
-                        (TILE_SIZE // 2, TILE_SIZE // 2),
-                        TILE_SIZE // 3
-                    )
-                    screen.blit(flame, (c * TILE_SIZE, r * TILE_SIZE))
+            ft = flames_at.get((c, r))
+            if ft:
+                alpha = int((ft[2] / (FPS * 3)) * 255)
+                flame = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+
+                pygame.draw.circle(
+                    flame,
+                    (*E_FIRE, alpha),
+                    (TILE_SIZE // 2, TILE_SIZE // 2),
+                    TILE_SIZE // 2
+                )
+                pygame.draw.circle(
+                    flame,
+                    (255, 200, 50, alpha // 2),
+                    (TILE_SIZE // 2, TILE_SIZE // 2),
+                    TILE_SIZE // 3
+                )
+                screen.blit(flame, (c * TILE_SIZE, r * TILE_SIZE))
 
             # Hover highlight
             if (c, r) == hovered_cell:
@@ -125,165 +141,147 @@ def draw_ui(
                 screen.blit(s, (c * TILE_SIZE, r * TILE_SIZE))
 
             # Move + attack range preview
-            if selected_pos:
-                sc, sr = selected_pos
-                sel_card = grid.tiles[sc][sr].card
-                if sel_card and sel_card.owner == "player":
-                    from grid import bfs_reachable
-
-                    # MOVE RANGE (graph-based)
-                    move_reachable = bfs_reachable((sc, sr), sel_card.move_range, grid)
-
-                    if (c, r) in move_reachable:
-                        m = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                        m.fill((0, 200, 255, 25))
-                        screen.blit(m, (c * TILE_SIZE, r * TILE_SIZE))
-
-                    # ATTACK RANGE (graph-based)
-                    max_range = max(atk.attack_range for atk in sel_card.attacks)
-                    attack_reachable = bfs_reachable((sc, sr), max_range, grid)
+            if (c, r) in move_reachable:
+                m = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+                m.fill((0, 200, 255, 25))
+                screen.blit(m, (c * TILE_SIZE, r * TILE_SIZE))
 
-                    if (c, r) in attack_reachable:
-                        a = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                        a.fill((255, 255, 0, 18))
-                        screen.blit(a, (c * TILE_SIZE, r * TILE_SIZE))
+            if (c, r) in attack_reachable:
+                a = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+                a.fill((255, 255, 0, 18))
+                screen.blit(a, (c * TILE_SIZE, r * TILE_SIZE))
 
 
 
     # =================================================
     # DRAW CARDS
     # =================================================
-    for c in range(grid.cols):
-        for r in range(grid.rows):
+    for c, r, card in grid.occupied():
 
-            card = grid.tiles[c][r].card
-            if not card:
-                continue
+        cx, cy = cell_center(c, r)
 
-            cx, cy = cell_center(c, r)
+        # ------------------------------
+        # DISPLAY HP INIT + SMOOTHING
+        # ------------------------------
+        if card.display_hp is None:
+            card.display_hp = card.hp
 
-            # ------------------------------
-            # DISPLAY HP INIT + SMOOTHING
-            # ------------------------------
-            if card.display_hp is None:
-                card.display_hp = card.hp
+        card.display_hp = card.hp
 
-            card.display_hp = card.hp
+        # ------------------------------
+        # BASE COLOR
+        # ------------------------------
+        color = C_PLAYER if card.owner == "player" else C_ENEMY
 
-            # ------------------------------
-            # BASE COLOR
-            # ------------------------------
-            color = C_PLAYER if card.owner == "player" else C_ENEMY
+        # ⚡ DAMAGE FLASH
+        if card.flash_timer > 0:
+            color = (255, 255, 255)
+            card.flash_timer -= 1
 
-            # ⚡ DAMAGE FLASH
-            if card.flash_timer > 0:
-                color = (255, 255, 255)
-                card.flash_timer -= 1
+        # 💚 HEAL FLASH
+        elif card.heal_flash_timer > 0:
+            color = (120, 255, 120)
+            card.heal_flash_timer -= 1
 
-            # 💚 HEAL FLASH
-            elif card.heal_flash_timer > 0:
-                color = (120, 255, 120)
-                card.heal_flash_timer -= 1
 
+        # ------------------------------
+        # CARD BODY
+        # ------------------------------
+        draw_card_shape(
+            screen,
+            cx,
+            cy,
+            TILE_SIZE - 10,
+            color,
+            is_circle=(card.owner == "enemy" or card.owner=="player")
+            
+        )
 
-            # ------------------------------
-            # CARD BODY
-            # ------------------------------
-            draw_card_shape(
+        # ------------------------------
+        # ⭐ RARITY BORDER
+        # ------------------------------
+        if card.rarity == "legendary":
+            pygame.draw.rect(
                 screen,
-                cx,
-                cy,
-                TILE_SIZE - 10,
-                color,
-                is_circle=(card.owner == "enemy" or card.owner=="player")
-                
+                (255, 215, 0),
+                pygame.Rect(
+                    cx - TILE_SIZE // 2,
+                    cy - TILE_SIZE // 2,
+                    TILE_SIZE,
+                    TILE_SIZE
+                ),
+                3
             )
 
-            # ------------------------------
-            # ⭐ RARITY BORDER
-            # ------------------------------
-            if card.rarity == "legendary":
-                pygame.draw.rect(
-                    screen,
-                    (255, 215, 0),
-                    pygame.Rect(
-                        cx - TILE_SIZE // 2,
-                        cy - TILE_SIZE // 2,
-                        TILE_SIZE,
-                        TILE_SIZE
-                    ),
-                    3
-                )
+        # ------------------------------
+        # ELEMENT RING
+        # ------------------------------
+        element_colors = {
+            "fire": E_FIRE,
+            "water": E_WATER,
+            "leaf": E_LEAF,
+            "null": E_NULL
+        }
 
-            # ------------------------------
-            # ELEMENT RING
-            # ------------------------------
-            element_colors = {
-                "fire": E_FIRE,
-                "water": E_WATER,
-                "leaf": E_LEAF,
-                "null": E_NULL
-            }
+        pygame.draw.circle(
+            screen,
+            element_colors.get(card.element, C_WHITE),
+            (cx, cy),
+            TILE_SIZE // 2 - 6,
+            3
+        )
 
+        # ------------------------------
+        # 💚 HEALING RING (VISUAL FEEDBACK)
+        # ------------------------------
+        if card.heal_flash_timer > 0:
             pygame.draw.circle(
                 screen,
-                element_colors.get(card.element, C_WHITE),
+                (100, 255, 100),     # soft green
                 (cx, cy),
-                TILE_SIZE // 2 - 6,
-                3
+                TILE_SIZE // 2,
+                4
             )
 
-            # ------------------------------
-            # 💚 HEALING RING (VISUAL FEEDBACK)
-            # ------------------------------
-            if card.heal_flash_timer > 0:
-                pygame.draw.circle(
-                    screen,
-                    (100, 255, 100),     # soft green
-                    (cx, cy),
-                    TILE_SIZE // 2,
-                    4
-                )
-
 
-            # ------------------------------
-            # LABEL
-            # ------------------------------
-            label = f"P{card.index + 1}" if card.owner == "player" else f"E{card.index + 1}"
-            txt = FONT_BIG.render(label, True, C_WHITE)
-            screen.blit(
-                txt,
-                (cx - txt.get_width() // 2, cy - txt.get_height() // 2)
-            )
+        # ------------------------------
+        # LABEL
+        # ------------------------------
+        label = f"P{card.index + 1}" if card.owner == "player" else f"E{card.index + 1}"
+        txt = FONT_BIG.render(label, True, C_WHITE)
+        screen.blit(
+            txt,
+            (cx - txt.get_width() // 2, cy - txt.get_height() // 2)
+        )
 
-            # ------------------------------
-            # HP BAR
-            # ------------------------------
-            hp_ratio = max(0, card.display_hp / card.max_hp)
+        # ------------------------------
+        # HP BAR
+        # ------------------------------
+        hp_ratio = max(0, card.display_hp / card.max_hp)
 
-            bar_w, bar_h = 70, 9
-            hx = cx - bar_w // 2
-            hy = cy - TILE_SIZE // 2 - 28
+        bar_w, bar_h = 70, 9
+        hx = cx - bar_w // 2
+        hy = cy - TILE_SIZE // 2 - 28
 
-            pygame.draw.rect(
-                screen,
-                (0, 0, 0),
-                (hx, hy, bar_w, bar_h),
-                border_radius=3
-            )
+        pygame.draw.rect(
+            screen,
+            (0, 0, 0),
+            (hx, hy, bar_w, bar_h),
+            border_radius=3
+        )
 
-            pygame.draw.rect(
-                screen,
-                (0, 200, 0),
-                (hx, hy, int(bar_w * hp_ratio), bar_h),
-                border_radius=3
-            )
+        pygame.draw.rect(
+            screen,
+            (0, 200, 0),
+            (hx, hy, int(bar_w * hp_ratio), bar_h),
+            border_radius=3
+        )
 
-            hp_txt = FONT_MAIN.render(str(card.hp), True, C_WHITE)
-            screen.blit(
-                hp_txt,
-                (cx - hp_txt.get_width() // 2, hy + 12)
-            )
+        hp_txt = FONT_MAIN.render(str(card.hp), True, C_WHITE)
+        screen.blit(
+            hp_txt,
+            (cx - hp_txt.get_width() // 2, hy + 12)
+        )
 
     # =================================================
     # ANIMATIONS